@@ -5,6 +5,11 @@
 #              are available and how they're implemented.
 #              Don't modify the contents of this file.
 
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from hashlib import blake2b
+
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
@@ -16,29 +21,33 @@ class DynamicArray:
     """
     Class implementing a Dynamic Array
     Supported methods are:
-    append, pop, swap, get_at_index, set_at_index, length
+    append, pop, swap, get_at_index, set_at_index, length,
+    extend, fill, slice, copy_range, getter, memoryview, iterator
+
+    Given a typecode (see the array module, e.g. 'Q' or 'B'), the elements are stored
+    unboxed in an array.array instead of a list, and memoryview() exposes them without
+    copying.
     """
 
-    def __init__(self, arr=None) -> None:
-        """Initialize new dynamic array using a list."""
-        self._data = arr.copy() if arr else []
+    def __init__(self, arr=None, typecode: str = None) -> None:
+        """Initialize new dynamic array using a list (or any iterable)."""
+        self._typecode = typecode
+        if typecode is not None:
+            self._data = array(typecode, arr if arr else [])
+        else:
+            self._data = list(arr) if arr else []
 
     def __iter__(self):
         """
-        Disable iterator capability for DynamicArray class
-        This means loops and aggregate functions like
-        those shown below won't work:
-
-        da = DynamicArray()
-        for value in da:        # will not work
-        min(da)                 # will not work
-        max(da)                 # will not work
-        sort(da)                # will not work
+        Return an iterator over the elements. It reads the underlying storage directly,
+        with no per-element bounds check, so a full scan runs at C speed.
         """
-        return None
+        return iter(self._data)
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
+        if self._typecode is not None:
+            return str(self._data.tolist())
         return str(self._data)
 
     # def __repr__(self):
@@ -83,6 +92,52 @@ class DynamicArray:
         """Return length of array."""
         return len(self._data)
 
+    def extend(self, values) -> None:
+        """Add every element of values (a DynamicArray or any iterable) at the end of the array."""
+        self._data.extend(values._data if isinstance(values, DynamicArray) else values)
+
+    def fill(self, value: object, n: int) -> None:
+        """Add n copies of value at the end of the array."""
+        if self._typecode is not None:
+            self._data.extend(array(self._typecode, [value]) * n)
+        else:
+            self._data.extend([value] * n)
+
+    def slice(self, start: int, end: int) -> "DynamicArray":
+        """Return a new array (same typecode) holding the elements from start up to end."""
+        if start < 0 or end > self.length() or start > end:
+            raise DynamicArrayException
+        new_da = DynamicArray(typecode=self._typecode)
+        new_da._data = self._data[start:end]
+        return new_da
+
+    def copy_range(self, source: "DynamicArray", source_start: int, start: int, count: int) -> None:
+        """
+        Overwrite count elements starting at start with count elements of source
+        starting at source_start. Bounds are checked once for the whole range.
+        """
+        if (count < 0 or source_start < 0 or start < 0 or source_start + count > source.length()
+                or start + count > self.length()):
+            raise DynamicArrayException
+        self._data[start:start + count] = source._data[source_start:source_start + count]
+
+    def getter(self) -> callable:
+        """
+        Return a function taking an index to its element without the bounds check of
+        get_at_index(), for hot loops that only compute valid indexes. Out of range
+        indexes behave as they do on a list.
+        """
+        return self._data.__getitem__
+
+    def memoryview(self) -> memoryview:
+        """
+        Return a memoryview of a typed array's storage, without copying.
+        The array cannot change length while the view is alive.
+        """
+        if self._typecode is None:
+            raise DynamicArrayException
+        return memoryview(self._data)
+
 
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
@@ -102,6 +157,245 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# Further hash functions with the same signature as the samples above, so any of them
+# can be passed as the `function` argument of either HashMap. All return unsigned
+# 64-bit integers and work on the UTF-8 bytes of the key.
+
+_MASK_64 = (1 << 64) - 1
+
+_FNV_OFFSET_64 = 0xCBF29CE484222325
+_FNV_PRIME_64 = 0x100000001B3
+
+_PRIME64_1 = 0x9E3779B185EBCA87
+_PRIME64_2 = 0xC2B2AE3D27D4EB4F
+_PRIME64_3 = 0x165667B19E3779F9
+_PRIME64_4 = 0x85EBCA77C2B2AE63
+_PRIME64_5 = 0x27D4EB2F165667C5
+_GOLDEN_64 = 0x9E3779B97F4A7C15
+
+
+def hash_function_fnv1a(key: str) -> int:
+    """64-bit FNV-1a: xor in each byte, then multiply by the FNV prime"""
+    hash = _FNV_OFFSET_64
+    for byte in key.encode():
+        hash = ((hash ^ byte) * _FNV_PRIME_64) & _MASK_64
+    return hash
+
+
+def _rotl64(value: int, bits: int) -> int:
+    """Rotate a 64-bit value left by the given number of bits"""
+    return ((value << bits) | (value >> (64 - bits))) & _MASK_64
+
+
+def hash_function_xx(key: str) -> int:
+    """
+    xxHash64-style multiply/rotate mixer. The key is consumed eight bytes at a time
+    (unpacked in C by struct), so the Python loop runs once per word, not per character.
+    """
+    data = key.encode()
+    length = len(data)
+    words = length >> 3
+    hash = (_PRIME64_5 + length) & _MASK_64
+    # Rotations are written out inline; this loop is the hot path.
+    for word in struct.unpack_from('<%dQ' % words, data):
+        word = (word * _PRIME64_2) & _MASK_64
+        word = ((((word << 31) | (word >> 33)) & _MASK_64) * _PRIME64_1) & _MASK_64
+        hash ^= word
+        hash = ((((hash << 27) | (hash >> 37)) & _MASK_64) * _PRIME64_1 + _PRIME64_4) & _MASK_64
+    if length & 7:
+        hash ^= (int.from_bytes(data[words << 3:], 'little') * _PRIME64_5) & _MASK_64
+        hash = ((((hash << 11) | (hash >> 53)) & _MASK_64) * _PRIME64_1) & _MASK_64
+
+    # Final avalanche so every input bit affects the low bits used for the bucket index.
+    hash ^= hash >> 33
+    hash = (hash * _PRIME64_2) & _MASK_64
+    hash ^= hash >> 29
+    hash = (hash * _PRIME64_3) & _MASK_64
+    hash ^= hash >> 32
+    return hash
+
+
+def _sip_round(v0: int, v1: int, v2: int, v3: int) -> (int, int, int, int):
+    """One SipRound over the four 64-bit state words"""
+    v0 = (v0 + v1) & _MASK_64
+    v1 = _rotl64(v1, 13) ^ v0
+    v0 = _rotl64(v0, 32)
+    v2 = (v2 + v3) & _MASK_64
+    v3 = _rotl64(v3, 16) ^ v2
+    v0 = (v0 + v3) & _MASK_64
+    v3 = _rotl64(v3, 21) ^ v0
+    v2 = (v2 + v1) & _MASK_64
+    v1 = _rotl64(v1, 17) ^ v2
+    v2 = _rotl64(v2, 32)
+    return v0, v1, v2, v3
+
+
+def sip_hash(key: str, seed: int = 0) -> int:
+    """
+    SipHash-1-3 (the variant CPython uses for str) keyed by a 128-bit seed.
+    Without knowing the seed, nobody can choose keys that collide on purpose.
+    """
+    k0 = seed & _MASK_64
+    k1 = (seed >> 64) & _MASK_64
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    data = key.encode()
+    length = len(data)
+    words = length >> 3
+    for word in struct.unpack_from('<%dQ' % words, data):
+        v3 ^= word
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+        v0 ^= word
+    # Last block: remaining bytes with the length in the top byte.
+    word = int.from_bytes(data[words << 3:], 'little') | ((length & 0xFF) << 56)
+    v3 ^= word
+    v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+    v0 ^= word
+
+    v2 ^= 0xFF
+    for _ in range(3):
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def seeded_hash_function(seed: int):
+    """
+    Return a one-argument hash function (usable as a HashMap `function`) that runs
+    sip_hash with the given seed.
+    """
+    def hash_function_sip(key: str) -> int:
+        return sip_hash(key, seed)
+
+    hash_function_sip.seed = seed
+    # Every seeded function is the same code, told apart by its seed (see hash_function_id()).
+    hash_function_sip.__qualname__ = hash_function_sip.__name__
+    return hash_function_sip
+
+
+def hash_function_id(function) -> str:
+    """
+    Return the name a hash function is recorded under when a table is saved to a file:
+    its module and qualified name. Seeded functions include their seed (in hex, so the id
+    fits an mmap header), since it changes every hash. Returns '' for functions a name does not identify: lambdas, functions
+    defined inside other functions (one name, many closures) and Python's hash(), which
+    is salted per process.
+    """
+    name = f"{getattr(function, '__module__', None)}.{getattr(function, '__qualname__', '<lambda>')}"
+    seed = getattr(function, 'seed', None)
+    if seed is not None:
+        return f"{name}:{seed:x}"
+    if '<lambda>' in name or '<locals>' in name or function is hash:
+        return ''
+    return name
+
+
+def _mix64(value: int) -> int:
+    """The splitmix64 finalizer: spreads every input bit over all 64 output bits."""
+    value &= _MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return value ^ (value >> 31)
+
+
+def hash_number(key) -> int:
+    """
+    O(1) hash of an int, float or other number: Python's own numeric hash (the same for
+    1, 1.0 and True, which compare equal, and the same in every process) times the
+    golden ratio constant, so runs of consecutive ids do not map to runs of hashes.
+    The high half is folded into the low one: on its own the product still leaves a
+    run of ids on a lattice that, modulo some prime capacities, clusters badly.
+    """
+    hash_value = (hash(key) * _GOLDEN_64) & _MASK_64
+    return hash_value ^ (hash_value >> 32)
+
+
+def hash_bytes(key: bytes, seed: int = None) -> int:
+    """
+    Hash of a bytes key with BLAKE2b (done in C, so no per-byte Python loop),
+    keyed by a 128-bit seed if one is given.
+    """
+    if seed is None:
+        digest = blake2b(key, digest_size=8).digest()
+    else:
+        digest = blake2b(key, digest_size=8, key=seed.to_bytes(16, 'little')).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _hash_tuple(key: tuple, item_hash) -> int:
+    """Combines the hashes of the items of a tuple, xxHash style (as CPython does)."""
+    acc = _PRIME64_5
+    for item in key:
+        acc = (acc + item_hash(item) * _PRIME64_2) & _MASK_64
+        acc = _rotl64(acc, 31)
+        acc = (acc * _PRIME64_1) & _MASK_64
+    return acc ^ len(key)
+
+
+# Key types key_hash_function() hashes the same way in every process.
+_STABLE_KEY_TYPES = frozenset((str, bytes, int, float, bool, complex))
+
+
+def key_hash_is_stable(key: object) -> bool:
+    """
+    Return True if key_hash_function() hashes key the same way in every process: str,
+    bytes and numbers, and tuples of them. Other keys fall back to Python's hash(), which
+    some types (e.g. frozensets of strings) salt per process.
+    """
+    if type(key) in _STABLE_KEY_TYPES or isinstance(key, (str, bytes)):
+        return True
+    if isinstance(key, tuple):
+        return all(key_hash_is_stable(item) for item in key)
+    return False
+
+
+def key_hash_function(function):
+    """
+    Return a hash function for keys of any hashable type, built around function, which
+    keeps hashing the str keys:
+    - ints, floats and bools: hash_number(), in O(1) and without formatting them as text
+    - bytes: hash_bytes()
+    - tuples: their items' hashes combined, each item hashed by these same rules
+    - anything else: Python's hash(), mixed. Some types (e.g. frozensets of strings) hash
+      differently in every process (see key_hash_is_stable()), so dumps of such keys are
+      put() again on load.
+    If function is seeded (seeded_hash_function()), the non-str paths are keyed by the
+    same seed, so no key type can be used to force collisions.
+    :param function: Hash function for str keys.
+    :return: Hash function for any key.
+    """
+    seed = getattr(function, 'seed', None)
+
+    def hash_any_key(key) -> int:
+        if type(key) is str:
+            return function(key)
+        if type(key) is int and seed is None:
+            # hash_number() inlined: int ids are the hot non-str case.
+            hash_value = (hash(key) * _GOLDEN_64) & _MASK_64
+            return hash_value ^ (hash_value >> 32)
+        if isinstance(key, str):
+            return function(str(key))
+        if isinstance(key, bytes):
+            return hash_bytes(key, seed)
+        if isinstance(key, tuple):
+            return _hash_tuple(key, hash_any_key)
+        if seed is None:
+            return hash_number(key)
+        # Keyed number hashing works on the digits themselves, since hash() collisions
+        # (n and n + 2**61 - 1) are easy to produce. Floats equal to ints hash as those ints.
+        if isinstance(key, float) and key.is_integer():
+            key = int(key)
+        if isinstance(key, int):
+            return hash_bytes(key.to_bytes(key.bit_length() // 8 + 1, 'little', signed=True), seed)
+        if isinstance(key, float):
+            return hash_bytes(struct.pack('<d', key), seed)
+        return _mix64(hash(key) ^ seed)
+
+    return hash_any_key
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -109,11 +403,19 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    # No per-node __dict__; maps can hold millions of these.
+    __slots__ = ('key', 'value', 'next', 'hash_value')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash_value: int = None) -> None:
+        """
+        Initialize node given a key and value.
+        hash_value caches the full (pre-modulo) hash of key, if the caller has it.
+        """
         self.key = key
         self.value = value
         self.next = next
+        self.hash_value = hash_value
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -147,7 +449,8 @@ class LinkedListIterator:
 class LinkedList:
     """
     Class implementing a Singly Linked List
-    Supported methods are: insert, remove, contains, length, iterator
+    Supported methods are: insert, insert_node, remove, pop, contains, locate, unlink, copy,
+    length, iterator
     """
 
     def __init__(self) -> None:
@@ -174,52 +477,248 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
-        """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+    def insert(self, key: str, value: object, hash_value: int = None) -> None:
+        """Insert new node at front of the list, caching hash_value in it."""
+        self._head = SLNode(key, value, self._head, hash_value)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node in at the front of the list."""
+        node.next = self._head
+        self._head = node
+        self._size += 1
+
+    def remove(self, key: str, hash_value: int = None) -> bool:
         """
         Remove first node with matching key.
+        If hash_value is given, nodes with a different cached hash are skipped
+        without comparing keys.
         Return True if removal was successful, False otherwise.
         """
-        previous, node = None, self._head
-        while node:
+        return self.pop(key, hash_value) is not None
 
-            if node.key == key:
-                if previous:
-                    previous.next = node.next
-                else:
-                    self._head = node.next
-                self._size -= 1
-                return True
+    def pop(self, key: str, hash_value: int = None) -> SLNode:
+        """
+        Unlink the first node with matching key and return it, or None if no match.
+        hash_value is used the same way as in remove().
+        """
+        previous, node = self.locate(key, hash_value)
+        if node is not None:
+            self.unlink(previous, node)
+        return node
 
+    def locate(self, key: str, hash_value: int = None) -> (SLNode, SLNode):
+        """
+        Like contains(), but also returns what unlink() needs to remove the node
+        without walking the list again.
+        Return tuple: (node before the match or None if it is the head, matching node or None).
+        """
+        previous, node = None, self._head
+        while node:
+            if (hash_value is None or node.hash_value == hash_value) and node.key == key:
+                return previous, node
             previous, node = node, node.next
-        return False
+        return None, None
+
+    def unlink(self, previous: SLNode, node: SLNode) -> None:
+        """Unlink node, given the node before it as returned by locate()."""
+        if previous is not None:
+            previous.next = node.next
+        else:
+            self._head = node.next
+        self._size -= 1
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash_value: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If hash_value is given, nodes with a different cached hash are skipped
+        without comparing keys.
+        """
         node = self._head
+        if hash_value is None:
+            while node:
+                if node.key == key:
+                    return node
+                node = node.next
+            return node
         while node:
-            if node.key == key:
+            if node.hash_value == hash_value and node.key == key:
                 return node
             node = node.next
         return node
 
+    def copy(self) -> "LinkedList":
+        """Return a new list holding copies of every node, in the same order."""
+        new_list = LinkedList()
+        tail = None
+        for node in self:
+            new_node = SLNode(node.key, node.value, None, node.hash_value)
+            if tail:
+                tail.next = new_node
+            else:
+                new_list._head = new_node
+            tail = new_node
+        new_list._size = self._size
+        return new_list
+
     def length(self) -> int:
         """Return the length of the list."""
         return self._size
 
 
+# Key types whose < is a total order, so (hash, key) can be binary searched. Other types
+# may compare without raising yet not be totally ordered (< on frozensets is a subset test).
+_ORDERED_KEY_TYPES = frozenset((str, bytes, int, float, bool))
+
+
+def _is_ordered_key(key: object) -> bool:
+    """True if key can take part in (hash, key) ordering; NaN cannot."""
+    return type(key) in _ORDERED_KEY_TYPES and (type(key) is not float or key == key)
+
+
+def _node_order(node: SLNode) -> tuple:
+    """Sort key of a node in a SortedBucket: (hash, key)."""
+    return node.hash_value, node.key
+
+
+def _node_hash(node: SLNode) -> int:
+    """Sort key of a node in a SortedBucket whose keys cannot be ordered."""
+    return node.hash_value
+
+
+class SortedBucket:
+    """
+    Bucket for long separate chaining chains, with the same methods as LinkedList.
+    Nodes are kept in a Python list sorted by (hash, key) and found with binary search,
+    so lookups, inserts and removes take O(log n) comparisons however long the chain.
+    Keys other than str, bytes, int and float (see _ORDERED_KEY_TYPES), and keys with equal
+    hashes that cannot be compared (e.g. a str and an int), make the bucket order by hash
+    alone from then on and scan the run of equal hashes.
+    Supported methods are: insert, insert_node, remove, pop, contains, locate, unlink, copy,
+    length, iterator
+    """
+
+    def __init__(self, nodes=()) -> None:
+        """Initialize the bucket with the given SLNodes (e.g. a LinkedList being converted)."""
+        self._nodes = []
+        self._ordered = True
+        for node in nodes:
+            self.insert_node(node)
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'SORTED [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes in (hash, key) order."""
+        return iter(self._nodes)
+
+    def _locate(self, key: str, hash_value: int) -> int:
+        """Return the list index of the node with matching key, or -1 if no match."""
+        nodes = self._nodes
+        if hash_value is None:
+            for index in range(len(nodes)):
+                if nodes[index].key == key:
+                    return index
+            return -1
+        # A key that cannot be ordered is never in an ordered bucket (inserting it would
+        # have unordered the bucket), but the hash scan below still answers correctly.
+        if self._ordered and _is_ordered_key(key):
+            try:
+                index = bisect_left(nodes, (hash_value, key), key=_node_order)
+            except TypeError:
+                # Sorted by (hash, key) is also sorted by hash, so only the search changes.
+                self._ordered = False
+            else:
+                if index < len(nodes) and nodes[index].hash_value == hash_value and nodes[index].key == key:
+                    return index
+                return -1
+        index = bisect_left(nodes, hash_value, key=_node_hash)
+        while index < len(nodes) and nodes[index].hash_value == hash_value:
+            if nodes[index].key == key:
+                return index
+            index += 1
+        return -1
+
+    def insert(self, key: str, value: object, hash_value: int = None) -> None:
+        """Insert a new node in sorted position, caching hash_value in it."""
+        self.insert_node(SLNode(key, value, None, hash_value))
+
+    def insert_node(self, node: SLNode) -> None:
+        """Insert an existing node in sorted position. Its next link is not used."""
+        node.next = None
+        if self._ordered and not _is_ordered_key(node.key):
+            # Sorted by (hash, key) is also sorted by hash, so the nodes stay where they are.
+            self._ordered = False
+        if self._ordered:
+            try:
+                index = bisect_right(self._nodes, _node_order(node), key=_node_order)
+            except TypeError:
+                self._ordered = False
+            else:
+                self._nodes.insert(index, node)
+                return
+        self._nodes.insert(bisect_right(self._nodes, node.hash_value, key=_node_hash), node)
+
+    def remove(self, key: str, hash_value: int = None) -> bool:
+        """
+        Remove the node with matching key.
+        Return True if removal was successful, False otherwise.
+        """
+        return self.pop(key, hash_value) is not None
+
+    def pop(self, key: str, hash_value: int = None) -> SLNode:
+        """Remove the node with matching key and return it, or None if no match."""
+        index = self._locate(key, hash_value)
+        if index < 0:
+            return None
+        return self._nodes.pop(index)
+
+    def contains(self, key: str, hash_value: int = None) -> SLNode:
+        """Return node with matching key, or None if no match."""
+        index = self._locate(key, hash_value)
+        return self._nodes[index] if index >= 0 else None
+
+    def locate(self, key: str, hash_value: int = None) -> (int, SLNode):
+        """
+        Like contains(), but also returns what unlink() needs to remove the node
+        without searching again.
+        Return tuple: (list index of the match or -1, matching node or None).
+        """
+        index = self._locate(key, hash_value)
+        return (index, self._nodes[index]) if index >= 0 else (-1, None)
+
+    def unlink(self, index: int, node: SLNode) -> None:
+        """Remove node, given its list index as returned by locate()."""
+        del self._nodes[index]
+
+    def copy(self) -> "SortedBucket":
+        """Return a new bucket holding copies of every node."""
+        new_bucket = SortedBucket()
+        new_bucket._nodes = [SLNode(node.key, node.value, None, node.hash_value) for node in self._nodes]
+        new_bucket._ordered = self._ordered
+        return new_bucket
+
+    def length(self) -> int:
+        """Return the number of nodes in the bucket."""
+        return len(self._nodes)
+
+
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    # No per-entry __dict__; maps can hold millions of these.
+    __slots__ = ('key', 'value', 'is_tombstone', 'hash_value')
+
+    def __init__(self, key: str, value: object, hash_value: int = None) -> None:
+        """
+        Initialize an entry for use in a hash map.
+        hash_value caches the full (pre-modulo) hash of key, if the caller has it.
+        """
         self.key = key
         self.value = value
+        self.hash_value = hash_value
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -0,0 +1,58 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Benchmark of building a HashMap from a known set of pairs: a put() loop into
+#              a default-sized map (which resizes over and over as it fills) against
+#              HashMap.from_items() on a list and on a generator with expected_size.
+#
+# Usage: python bench_build.py [--sizes 100000 1000000]
+
+import argparse
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_fnv1a
+
+
+def put_loop(module, pairs: list):
+    """Builds the map one put() at a time from the default capacity."""
+    m = module.HashMap(11, hash_function_fnv1a)
+    put = m.put
+    for key, value in pairs:
+        put(key, value)
+    return m
+
+
+def from_list(module, pairs: list):
+    """Builds the map with from_items() on the list itself."""
+    return module.HashMap.from_items(pairs, hash_function_fnv1a)
+
+
+def from_generator(module, pairs: list):
+    """Builds the map with from_items() on a generator, passing its length."""
+    return module.HashMap.from_items((pair for pair in pairs), hash_function_fnv1a, len(pairs))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**5, 10**6])
+    args = parser.parse_args()
+
+    engines = (('SC', hash_map_sc), ('OA', hash_map_oa))
+    builders = (('put loop', put_loop), ('from_items list', from_list),
+                ('from_items gen', from_generator))
+    print(f"{'engine':<8}{'entries':>10}  {'build':<17}{'seconds':>9}{'capacity':>10}")
+    for size in args.sizes:
+        pairs = [('key' + str(i), i) for i in range(size)]
+        for engine, module in engines:
+            for name, build in builders:
+                start = time.perf_counter()
+                m = build(module, pairs)
+                elapsed = time.perf_counter() - start
+                assert m.get_size() == size
+                print(f"{engine:<8}{size:>10}  {name:<17}{elapsed:>9.2f}{m.get_capacity():>10}")
+                del m
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Benchmark of the bulk operations against the single-key loops they replace:
+#              put_many() against a put() loop, get_many() against a get() loop and
+#              contains_many() against a contains_key() loop, on both engines, for str and
+#              int keys.
+#
+# Usage: python bench_bulk.py [--sizes 100000 1000000] [--repeat 3]
+
+import argparse
+import time
+from itertools import product
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray, hash_function_fnv1a
+
+
+# str keys go through FNV-1a, which takes most of the time per key; int keys are hashed
+# inline, so their rows show the map's own overhead.
+KEY_KINDS = (('str', lambda i: 'key' + str(i)), ('int', lambda i: i))
+
+
+def put_loop(m, pairs: list, keys: list):
+    """Adds the pairs one put() at a time."""
+    put = m.put
+    for key, value in pairs:
+        put(key, value)
+
+
+def put_bulk(m, pairs: list, keys: list):
+    """Adds the pairs with put_many()."""
+    m.put_many(pairs)
+
+
+def get_loop(m, pairs: list, keys: list):
+    """Looks the keys up one get() at a time, collecting the values like get_many()."""
+    results = DynamicArray()
+    get = m.get
+    for key in keys:
+        results.append(get(key))
+    return results
+
+
+def get_bulk(m, pairs: list, keys: list):
+    """Looks the keys up with get_many()."""
+    return m.get_many(keys)
+
+
+def contains_loop(m, pairs: list, keys: list):
+    """Checks the keys one contains_key() at a time, collecting the answers like contains_many()."""
+    results = DynamicArray()
+    contains_key = m.contains_key
+    for key in keys:
+        results.append(contains_key(key))
+    return results
+
+
+def contains_bulk(m, pairs: list, keys: list):
+    """Checks the keys with contains_many()."""
+    return m.contains_many(keys)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**5, 10**6])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    engines = (('SC', hash_map_sc), ('OA', hash_map_oa))
+    operations = (('put', put_loop, put_bulk), ('get', get_loop, get_bulk),
+                  ('contains', contains_loop, contains_bulk))
+    print(f"{'engine':<8}{'entries':>10}  {'keys':<6}{'operation':<10}{'loop s':>9}{'bulk s':>9}"
+          f"{'speedup':>9}")
+    for size, (kind, make_key) in product(args.sizes, KEY_KINDS):
+        pairs = [(make_key(i), i) for i in range(size)]
+        # Half of the keys looked up are present, half are not.
+        keys = [make_key(i) for i in range(size // 2, size + size // 2)]
+        for engine, module in engines:
+            for name, loop, bulk in operations:
+                seconds = [float('inf'), float('inf')]
+                # Best of --repeat runs, alternating loop and bulk so both see the same noise.
+                for _, (i, run) in product(range(args.repeat), enumerate((loop, bulk))):
+                    # Every put run starts from the same pre-sized empty map; lookups use a full one.
+                    m = module.HashMap.from_items([], hash_function_fnv1a, size)
+                    if name != 'put':
+                        m.put_many(pairs)
+                    start = time.perf_counter()
+                    run(m, pairs, keys)
+                    seconds[i] = min(seconds[i], time.perf_counter() - start)
+                    assert m.get_size() == size
+                    del m
+                print(f"{engine:<8}{size:>10}  {kind:<6}{name:<10}{seconds[0]:>9.2f}{seconds[1]:>9.2f}"
+                      f"{seconds[0] / seconds[1]:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
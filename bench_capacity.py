@@ -0,0 +1,84 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Benchmark of the capacity policies in capacity.py. Times hit lookups on both
+#              engines under each policy, then removes most of the keys in waves and reports
+#              how much of the table's memory each policy gives back.
+#
+# Usage: python bench_capacity.py [--entries 200000] [--waves 3]
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_fnv1a
+from capacity import PowerOfTwoCapacity, PrimeCapacity, PrimeLadderCapacity
+
+POLICIES = (
+    ('prime', lambda: PrimeCapacity()),
+    ('prime ladder', lambda: PrimeLadderCapacity()),
+    ('power of two', lambda: PowerOfTwoCapacity()),
+    ('ladder+shrink', lambda: PrimeLadderCapacity(shrink_at=0.1)),
+    ('pow2+shrink', lambda: PowerOfTwoCapacity(shrink_at=0.1)),
+)
+
+
+def lookups(m, keys: list) -> float:
+    """Returns seconds to get() every key once."""
+    get = m.get
+    start = time.perf_counter()
+    for key in keys:
+        get(key)
+    return time.perf_counter() - start
+
+
+def deletion_waves(m, keys: list, waves: int) -> (int, int):
+    """
+    Removes nine in ten of the remaining keys, waves times over, and returns the bytes
+    the map held (keys excluded) before the first wave and after the last one.
+    """
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    remaining = keys
+    for _ in range(waves):
+        for key in remaining[len(remaining) // 10:]:
+            m.remove(key)
+        remaining = remaining[:len(remaining) // 10]
+    gc.collect()
+    assert m.get_size() == len(remaining)
+    return before, tracemalloc.get_traced_memory()[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=200000)
+    parser.add_argument('--waves', type=int, default=3, help='deletion waves, each removing 90%%')
+    args = parser.parse_args()
+
+    keys = ['key' + str(i) for i in range(args.entries)]
+    engines = (('SC', lambda policy: hash_map_sc.HashMap(11, hash_function_fnv1a, policy=policy)),
+               ('OA', lambda policy: hash_map_oa.HashMap(11, hash_function_fnv1a, policy=policy)))
+    print(f"{args.entries} keys, hash_function_fnv1a, {args.waves} deletion waves of 90%")
+    print(f"{'engine':<8}{'policy':<16}{'capacity':>10}{'get us':>9}"
+          f"{'MiB before':>12}{'MiB after':>11}{'capacity after':>16}")
+    for engine, make in engines:
+        for name, policy in POLICIES:
+            m = make(policy())
+            m.put_many((key, None) for key in keys)
+            capacity = m.get_capacity()
+            seconds = lookups(m, keys)
+            # Built again with tracing on, so tracemalloc does not slow the timed lookups.
+            tracemalloc.start()
+            m = make(policy())
+            m.put_many((key, None) for key in keys)
+            before, after = deletion_waves(m, keys, args.waves)
+            tracemalloc.stop()
+            print(f"{engine:<8}{name:<16}{capacity:>10}{seconds / len(keys) * 1e6:>9.2f}"
+                  f"{before / 2**20:>12.1f}{after / 2**20:>11.1f}{m.get_capacity():>16}")
+            del m
+
+
+if __name__ == "__main__":
+    main()
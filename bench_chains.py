@@ -0,0 +1,56 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Benchmark of adaptive buckets in hash_map_sc.HashMap on anagram-heavy keys,
+#              where hash_function_1 (a plain sum of character codes) sends every permutation
+#              of a word to the same bucket. Compares plain LinkedList chains with chains that
+#              turn into SortedBuckets past HashMap._TREEIFY_THRESHOLD.
+#
+# Usage: python bench_chains.py [--letters abcdefg] [--length 5]
+
+import argparse
+import time
+from itertools import permutations
+
+import hash_map_sc
+from a6_include import hash_function_1
+
+
+def run(keys: list) -> (float, float, float, int):
+    """Returns (put, get, remove) seconds and the longest chain after the puts."""
+    m = hash_map_sc.HashMap(11, hash_function_1)
+    start = time.perf_counter()
+    for key in keys:
+        m.put(key, key)
+    put = time.perf_counter() - start
+    longest = m.longest_chain()
+    start = time.perf_counter()
+    for key in keys:
+        m.get(key)
+    get = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in keys:
+        m.remove(key)
+    remove = time.perf_counter() - start
+    return put, get, remove, longest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--letters', default='abcdefg', help='alphabet the anagrams are drawn from')
+    parser.add_argument('--length', type=int, default=5, help='letters per key')
+    args = parser.parse_args()
+
+    keys = [''.join(p) for p in permutations(args.letters, args.length)]
+    print(f"{len(keys)} keys, hash_function_1")
+    print(f"{'buckets':<14}{'put s':>8}{'get s':>8}{'remove s':>10}{'longest chain':>15}")
+
+    threshold = hash_map_sc.HashMap._TREEIFY_THRESHOLD
+    for name, limit in (('linked lists', float('inf')), ('adaptive', threshold)):
+        hash_map_sc.HashMap._TREEIFY_THRESHOLD = limit
+        put, get, remove, longest = run(keys)
+        print(f"{name:<14}{put:>8.3f}{get:>8.3f}{remove:>10.3f}{longest:>15}")
+    hash_map_sc.HashMap._TREEIFY_THRESHOLD = threshold
+
+
+if __name__ == "__main__":
+    main()
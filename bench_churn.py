@@ -0,0 +1,66 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Delete/insert churn benchmark for the open addressing HashMaps. The number
+#              of live keys stays fixed while old keys are removed and new ones added, which
+#              leaves tombstones behind. Lookup latency should stay flat over time because
+#              tombstones count toward the load limit and get compacted away.
+#
+# Usage: python bench_churn.py [--live 20000] [--batch 2000] [--rounds 500] [--report 25]
+
+import argparse
+import random
+import time
+
+import hash_map_compact
+import hash_map_oa
+from a6_include import hash_function_fnv1a
+
+
+def lookup_latency(m, keys: list) -> float:
+    """Returns the mean get() time in microseconds over the given keys."""
+    start = time.perf_counter()
+    for key in keys:
+        m.get(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def churn(name: str, m, live: int, batch: int, rounds: int, report: int) -> None:
+    """Runs the churn workload on m, printing a line every report rounds."""
+    rnd = random.Random(261)
+    oldest, newest = 0, live
+    for i in range(live):
+        m.put('key' + str(i), i)
+
+    print(f"{name}")
+    print(f"{'round':>8}{'capacity':>10}{'tombstones':>12}{'hit us':>9}{'miss us':>9}")
+    for round_number in range(1, rounds + 1):
+        for i in range(oldest, oldest + batch):
+            m.remove('key' + str(i))
+        for i in range(newest, newest + batch):
+            m.put('key' + str(i), i)
+        oldest += batch
+        newest += batch
+        assert m.get_size() == live
+
+        if round_number % report == 0:
+            hits = ['key' + str(rnd.randrange(oldest, newest)) for _ in range(2000)]
+            misses = ['key' + str(rnd.randrange(0, oldest)) for _ in range(2000)]
+            print(f"{round_number:>8}{m.get_capacity():>10}{m.tombstones():>12}"
+                  f"{lookup_latency(m, hits):>9.2f}{lookup_latency(m, misses):>9.2f}")
+    print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--live', type=int, default=20000, help='live keys held at all times')
+    parser.add_argument('--batch', type=int, default=2000, help='keys deleted and inserted per round')
+    parser.add_argument('--rounds', type=int, default=500)
+    parser.add_argument('--report', type=int, default=25, help='rounds between latency samples')
+    args = parser.parse_args()
+
+    for name, module in (('OA', hash_map_oa), ('OA compact', hash_map_compact)):
+        churn(name, module.HashMap(11, hash_function_fnv1a), args.live, args.batch, args.rounds, args.report)
+
+
+if __name__ == "__main__":
+    main()
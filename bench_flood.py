@@ -0,0 +1,74 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Benchmark of the flood_guard option of both HashMaps against crafted keys that
+#              all share one hash: permutations of one word for hash_function_1, and strings
+#              of equal weighted character sum for hash_function_2. Without the guard every
+#              open addressing operation probes past all the colliding keys, so time per key
+#              grows with the number of keys (separate chaining already caps the damage with
+#              sorted buckets); with it the map rehashes under a random SipHash seed and
+#              time per key stays flat, at the price of the slower hash.
+#
+# Usage: python bench_flood.py [--sizes 1000 2000 4000]
+
+import argparse
+import random
+import time
+from itertools import islice, permutations
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_1, hash_function_2
+
+
+def permutation_keys(n: int) -> list:
+    """n distinct keys with equal hash_function_1: permutations of one word."""
+    return [''.join(p) for p in islice(permutations('abcdefghijk'), n)]
+
+
+def weighted_sum_keys(n: int) -> list:
+    """
+    n distinct keys with equal hash_function_2, found by sampling random words and
+    keeping those that land on the most common hash.
+    """
+    rng = random.Random(261)
+    groups = {}
+    while True:
+        key = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(8))
+        group = groups.setdefault(hash_function_2(key), set())
+        group.add(key)
+        if len(group) == n:
+            return sorted(group)
+
+
+def run(make, keys: list) -> float:
+    """Returns microseconds per key to put() every key and get() it back."""
+    m = make()
+    start = time.perf_counter()
+    for key in keys:
+        m.put(key, key)
+    for key in keys:
+        m.get(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2000, 4000])
+    args = parser.parse_args()
+
+    attacks = (('hash_function_1', hash_function_1, permutation_keys),
+               ('hash_function_2', hash_function_2, weighted_sum_keys))
+    engines = (('SC', lambda f, guard: hash_map_sc.HashMap(11, f, flood_guard=guard)),
+               ('OA', lambda f, guard: hash_map_oa.HashMap(11, f, flood_guard=guard)))
+    print(f"{'function':<17}{'engine':<8}{'keys':>7}{'unguarded us/key':>18}{'guarded us/key':>16}")
+    for function_name, function, make_keys in attacks:
+        for size in args.sizes:
+            keys = make_keys(size)
+            for engine, make in engines:
+                unguarded = run(lambda: make(function, False), keys)
+                guarded = run(lambda: make(function, True), keys)
+                print(f"{function_name:<17}{engine:<8}{size:>7}{unguarded:>18.1f}{guarded:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Speed and bucket-distribution benchmark for the hash functions in a6_include.
+#              For each key set it reports hashes/second, the chi-square statistic of the
+#              bucket counts (scaled so a uniform hash scores about 1.0), the longest SC chain
+#              at load 1.0, and the mean/max quadratic probe length at OA load 0.5.
+#
+# Usage: python bench_hash_functions.py [--keys 100000]
+
+import argparse
+import random
+import time
+from itertools import permutations, islice
+
+from a6_include import (hash_function_1, hash_function_2, hash_function_fnv1a,
+                        hash_function_xx, seeded_hash_function)
+
+
+def next_prime(n: int) -> int:
+    """Returns the smallest prime >= n, the same way the HashMaps pick their capacity."""
+    if n % 2 == 0:
+        n += 1
+    while any(n % f == 0 for f in range(3, int(n ** 0.5) + 1, 2)):
+        n += 2
+    return n
+
+
+def key_sets(count: int) -> dict:
+    """Builds the key sets used by the benchmark, each with count distinct keys."""
+    rnd = random.Random(261)
+    words = set()
+    while len(words) < count:
+        words.add(''.join(rnd.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rnd.randint(4, 12))))
+    return {
+        'str + i': ['str' + str(i) for i in range(count)],
+        'numeric ids': [str(i) for i in range(10**6, 10**6 + count)],
+        'anagrams': [''.join(p) for p in islice(permutations('abcdefghijk'), count)],
+        'random words': sorted(words),
+        'url paths': ['/api/v1/users/' + str(i) + '/orders/' + str(i * 7 % 1000) for i in range(count)],
+    }
+
+
+def chain_stats(hashes: list) -> (float, int):
+    """Returns (scaled chi-square, longest chain) for the hashes in a table at load 1.0."""
+    capacity = next_prime(len(hashes))
+    counts = [0] * capacity
+    for h in hashes:
+        counts[h % capacity] += 1
+    expected = len(hashes) / capacity
+    chi_square = sum((c - expected) ** 2 for c in counts) / expected
+    return chi_square / (capacity - 1), max(counts)
+
+
+def probe_stats(hashes: list) -> (float, int):
+    """Returns (mean, max) quadratic probe length when inserting into a table at load 0.5."""
+    capacity = next_prime(2 * len(hashes))
+    used = bytearray(capacity)
+    total = longest = 0
+    for h in hashes:
+        initial_index = index = h % capacity
+        count = 1
+        while used[index]:
+            index = (initial_index + count ** 2) % capacity
+            count += 1
+        used[index] = 1
+        total += count - 1
+        longest = max(longest, count - 1)
+    return total / len(hashes), longest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--keys', type=int, default=100000, help='keys per key set')
+    args = parser.parse_args()
+
+    functions = (
+        ('hash_function_1', hash_function_1),
+        ('hash_function_2', hash_function_2),
+        ('fnv1a', hash_function_fnv1a),
+        ('xx', hash_function_xx),
+        ('sip (seeded)', seeded_hash_function(random.getrandbits(128))),
+    )
+    header = f"{'keys':<14}{'function':<17}{'Mhash/s':>9}{'chi2/dof':>11}{'max chain':>11}" \
+             f"{'mean probe':>12}{'max probe':>11}"
+    print(header)
+    for set_name, keys in key_sets(args.keys).items():
+        for name, function in functions:
+            start = time.perf_counter()
+            hashes = [function(key) for key in keys]
+            rate = len(keys) / (time.perf_counter() - start) / 1e6
+            chi_square, max_chain = chain_stats(hashes)
+            mean_probe, max_probe = probe_stats(hashes)
+            print(f"{set_name:<14}{name:<17}{rate:>9.2f}{chi_square:>11.2f}{max_chain:>11}"
+                  f"{mean_probe:>12.2f}{max_probe:>11}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
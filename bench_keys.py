@@ -0,0 +1,49 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Benchmark of integer keys against the str(i) keys the PDF examples use.
+#              Times put() and get() of the same ids on both engines, once as ints (hashed
+#              in O(1)) and once formatted as strings (hashed a character at a time by
+#              hash_function_fnv1a; hash_function_1 is left out because digit strings that
+#              are permutations of each other all collide under it).
+#
+# Usage: python bench_keys.py [--entries 100000]
+
+import argparse
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_fnv1a
+
+
+def run(module, keys: list) -> (float, float):
+    """Returns seconds to put() every key into an empty map, then to get() each one back."""
+    m = module.HashMap(11, hash_function_fnv1a)
+    put, get = m.put, m.get
+    start = time.perf_counter()
+    for key in keys:
+        put(key, key)
+    middle = time.perf_counter()
+    for key in keys:
+        get(key)
+    return middle - start, time.perf_counter() - middle
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=100000)
+    args = parser.parse_args()
+
+    ids = list(range(args.entries))
+    key_sets = (('int', ids), ('str(i)', [str(i) for i in ids]))
+    engines = (('SC', hash_map_sc), ('OA', hash_map_oa))
+    print(f"{args.entries} ids")
+    print(f"{'engine':<8}{'keys':<8}{'put s':>8}{'get s':>8}")
+    for engine, module in engines:
+        for key_name, keys in key_sets:
+            put_seconds, get_seconds = run(module, keys)
+            print(f"{engine:<8}{key_name:<8}{put_seconds:>8.3f}{get_seconds:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
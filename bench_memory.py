@@ -0,0 +1,52 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Benchmark of memory per entry for the open addressing HashMap
+#              (one HashEntry per slot) against the compact parallel-array layout.
+#
+# Usage: python bench_memory.py [--sizes 1000000 10000000]
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import hash_map_compact
+import hash_map_oa
+import hash_map_sc
+
+
+def measure(module, keys: list, values: list) -> (int, float):
+    """
+    Builds a map from pre-allocated keys and values and returns the bytes the map
+    itself allocated (keys and values are excluded) and the build time in seconds.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    m = module.HashMap(11, hash)
+    for i in range(len(keys)):
+        m.put(keys[i], values[i])
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert m.get_size() == len(keys)
+    return used, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**5, 10**6])
+    args = parser.parse_args()
+
+    engines = (('OA', hash_map_oa), ('OA compact', hash_map_compact), ('SC', hash_map_sc))
+    print(f"{'engine':<12}{'entries':>12}{'MiB':>10}{'bytes/entry':>14}{'build s':>10}")
+    for size in args.sizes:
+        keys = ['key' + str(i) for i in range(size)]
+        values = list(range(size))
+        for name, module in engines:
+            used, elapsed = measure(module, keys, values)
+            print(f"{name:<12}{size:>12}{used / 2**20:>10.1f}{used / size:>14.1f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Scaling benchmark for hash_map_sc.find_mode_parallel from 1 to N worker
+#              processes, checked against the serial find_mode on the same input.
+#
+# Usage: python bench_parallel_mode.py [--size 10000000] [--distinct 100000] [--workers 1 2 4 8]
+
+import argparse
+import os
+import random
+import time
+
+from a6_include import DynamicArray
+from hash_map_sc import find_mode, find_mode_parallel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=10**7, help='values in the input DynamicArray')
+    parser.add_argument('--distinct', type=int, default=10**5, help='distinct values to draw from')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--chunk-size', type=int, default=250000)
+    args = parser.parse_args()
+
+    rnd = random.Random(261)
+    pool = ['value' + str(i) for i in range(args.distinct)]
+    da = DynamicArray([pool[int(rnd.paretovariate(1.2)) % args.distinct] for _ in range(args.size)])
+
+    start = time.perf_counter()
+    expected = find_mode(da)
+    serial = time.perf_counter() - start
+    print(f"{args.size} values, {args.distinct} distinct, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}  identical")
+    print(f"{'serial':>8}{serial:>10.2f}{1.0:>9.2f}x")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = find_mode_parallel(da, workers=workers, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        identical = str(result[0]) == str(expected[0]) and result[1] == expected[1]
+        print(f"{workers:>8}{elapsed:>10.2f}{serial / elapsed:>9.2f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Benchmark of the probing strategies in probing.py at load factors from 0.5
+#              to 0.9. Tables are filled directly through the strategy (the HashMap itself
+#              always resizes at 0.5), then hit and miss lookups are timed and their probe
+#              lengths recorded.
+#
+# Usage: python bench_probing.py [--entries 50000]
+
+import argparse
+import time
+
+from a6_include import DynamicArray, HashEntry, hash_function_fnv1a
+from probing import DoubleHashing, LinearProbing, QuadraticProbing, RobinHoodProbing
+
+
+def next_prime(n: int) -> int:
+    """Returns the smallest prime >= n, the same way the HashMaps pick their capacity."""
+    if n % 2 == 0:
+        n += 1
+    while any(n % f == 0 for f in range(3, int(n ** 0.5) + 1, 2)):
+        n += 2
+    return n
+
+
+def fill(strategy, entries: list, capacity: int) -> DynamicArray:
+    """
+    Inserts the (key, hash) pairs into a fresh table through the strategy.
+    Returns None if the strategy cannot find a free slot for some key at this load.
+    """
+    buckets = DynamicArray([None] * capacity)
+    for key, hash_value in entries:
+        index, found, probes = strategy.probe(buckets, capacity, key, hash_value)
+        resident = buckets.get_at_index(index)
+        # A tombstone strategy that comes back with a live slot ran out of probe sequence.
+        if strategy.uses_tombstones and resident is not None and not resident.is_tombstone:
+            return None
+        strategy.insert(buckets, capacity, index, HashEntry(key, None, hash_value), probes)
+    return buckets
+
+
+def lookups(strategy, buckets: DynamicArray, capacity: int, entries: list) -> (float, int, float):
+    """Returns (mean probes, max probes, lookups per second) for the given (key, hash) pairs."""
+    probe = strategy.probe
+    total = longest = 0
+    start = time.perf_counter()
+    for key, hash_value in entries:
+        probes = probe(buckets, capacity, key, hash_value)[2]
+        total += probes
+        if probes > longest:
+            longest = probes
+    elapsed = time.perf_counter() - start
+    return total / len(entries), longest, len(entries) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=50000)
+    args = parser.parse_args()
+
+    hits = [('key' + str(i), hash_function_fnv1a('key' + str(i))) for i in range(args.entries)]
+    misses = [('miss' + str(i), hash_function_fnv1a('miss' + str(i))) for i in range(args.entries)]
+    strategies = (LinearProbing(), QuadraticProbing(), DoubleHashing(), RobinHoodProbing())
+
+    print(f"{'load':>5} {'strategy':<12}{'hit mean':>9}{'hit max':>8}{'hit kops':>9}"
+          f"{'miss mean':>10}{'miss max':>9}{'miss kops':>10}")
+    for load in (0.5, 0.6, 0.7, 0.8, 0.9):
+        capacity = next_prime(int(args.entries / load))
+        for strategy in strategies:
+            buckets = fill(strategy, hits, capacity)
+            if buckets is None:
+                print(f"{load:>5} {strategy.name:<12}  table full: probe sequence does not reach a free slot")
+                continue
+            hit_mean, hit_max, hit_rate = lookups(strategy, buckets, capacity, hits)
+            miss_mean, miss_max, miss_rate = lookups(strategy, buckets, capacity, misses)
+            print(f"{load:>5} {strategy.name:<12}{hit_mean:>9.2f}{hit_max:>8}{hit_rate / 1e3:>9.0f}"
+                  f"{miss_mean:>10.2f}{miss_max:>9}{miss_rate / 1e3:>10.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
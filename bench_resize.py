@@ -0,0 +1,92 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Benchmark of resize_table() for both HashMaps, comparing the direct
+#              rehash path against the old approach of re-inserting through put().
+#
+# Usage: python bench_resize.py [--sizes 100000 1000000 10000000] [--legacy-limit 100000]
+
+import argparse
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray, LinkedList
+
+
+def legacy_resize_oa(m: hash_map_oa.HashMap, new_capacity: int) -> None:
+    """
+    Rebuilds an open addressing map the way resize_table() used to: allocate the new
+    array one append at a time, then put() every live entry back in.
+    """
+    old_da = m._buckets
+    m._capacity = m._next_prime(new_capacity)
+    m._buckets = DynamicArray()
+    for _ in range(m._capacity):
+        m._buckets.append(None)
+    m._size = 0
+    m._reset_counters()
+    for i in range(old_da.length()):
+        if old_da[i] and not old_da[i].is_tombstone:
+            m.put(old_da[i].key, old_da[i].value)
+
+
+def legacy_resize_sc(m: hash_map_sc.HashMap, new_capacity: int) -> None:
+    """
+    Rebuilds a separate chaining map the way resize_table() used to: fresh LinkedLists,
+    then put() every node's key/value pair back in.
+    """
+    old_da = m._buckets
+    m._capacity = m._next_prime(new_capacity)
+    m._buckets = DynamicArray()
+    for _ in range(m._capacity):
+        m._buckets.append(LinkedList())
+    m._size = 0
+    m._chain_counts = [m._capacity]
+    m._longest_chain = 0
+    for i in range(old_da.length()):
+        for node in old_da[i]:
+            m.put(node.key, node.value)
+
+
+def build(module, size: int):
+    """
+    Returns a map of the given engine holding size entries at its normal load.
+    Python's built-in hash is used because the sample hash functions collapse
+    large key sets onto a few thousand values, which would swamp the measurement.
+    """
+    m = module.HashMap(11, hash)
+    m.put_many(('key' + str(i), i) for i in range(size))
+    return m
+
+
+def time_resize(module, size: int, resize) -> float:
+    """Returns the seconds taken by one resize of a freshly built map to twice its capacity."""
+    m = build(module, size)
+    start = time.perf_counter()
+    resize(m, m.get_capacity() * 2)
+    elapsed = time.perf_counter() - start
+    assert m.get_size() == size
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**5, 10**6, 10**7])
+    parser.add_argument('--legacy-limit', type=int, default=10**5,
+                        help='largest size to also time through the old put() path')
+    args = parser.parse_args()
+
+    engines = (('OA', hash_map_oa, legacy_resize_oa), ('SC', hash_map_sc, legacy_resize_sc))
+    print(f"{'engine':<8}{'entries':>12}{'put() path s':>16}{'direct s':>12}{'speedup':>10}")
+    for size in args.sizes:
+        for name, module, legacy in engines:
+            direct = time_resize(module, size, lambda m, c: m.resize_table(c))
+            if size <= args.legacy_limit:
+                before = time_resize(module, size, legacy)
+                print(f"{name:<8}{size:>12}{before:>16.3f}{direct:>12.3f}{before / direct:>9.1f}x")
+            else:
+                print(f"{name:<8}{size:>12}{'skipped':>16}{direct:>12.3f}{'':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Read throughput of snapshot_map.SnapshotHashMap against a HashMap behind one
+#              global lock, with 1..N reader threads doing gets while a writer thread applies
+#              a batch of puts and removes at a fixed interval.
+#
+# Usage: python bench_snapshot.py [--keys 50000] [--readers 1 2 4] [--seconds 2]
+#                                 [--batch 100] [--interval 0.01]
+
+import argparse
+import random
+import threading
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_fnv1a
+from snapshot_map import SnapshotHashMap
+
+ENGINES = {'OA': hash_map_oa.HashMap, 'SC': hash_map_sc.HashMap}
+
+
+class LockedHashMap:
+    """The baseline: one HashMap, with every get and every batch under a single lock."""
+
+    def __init__(self, engine) -> None:
+        self._map = engine(11, hash_function_fnv1a)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> object:
+        with self._lock:
+            return self._map.get(key)
+
+    def apply(self, ops: list) -> None:
+        with self._lock:
+            for key, value, removing in ops:
+                if removing:
+                    self._map.remove(key)
+                else:
+                    self._map.put(key, value)
+
+
+class SnapshotAdapter:
+    """Gives SnapshotHashMap the same get/apply interface as LockedHashMap."""
+
+    def __init__(self, engine) -> None:
+        self._map = SnapshotHashMap(11, hash_function_fnv1a, engine)
+        self.get = self._map.get
+
+    def apply(self, ops: list) -> None:
+        for key, value, removing in ops:
+            if removing:
+                self._map.remove(key)
+            else:
+                self._map.put(key, value)
+        self._map.publish()
+
+
+def run(target, keys: list, readers: int, seconds: float, batch: int, interval: float) -> (float, int):
+    """Returns (total reads per second, batches applied) for one configuration."""
+    target.apply([(key, i, False) for i, key in enumerate(keys)])
+    stop = threading.Event()
+    reads = [0] * readers
+    batches = [0]
+
+    def reader(slot: int) -> None:
+        rnd = random.Random(slot)
+        get = target.get
+        count = 0
+        while not stop.is_set():
+            for _ in range(1000):
+                get(keys[rnd.randrange(len(keys))])
+            count += 1000
+        reads[slot] = count
+
+    def writer() -> None:
+        rnd = random.Random(261)
+        while not stop.is_set():
+            chosen = rnd.sample(keys, batch)
+            # Half the batch updates keys in place, half removes and re-adds them.
+            ops = [(key, 0, False) for key in chosen[:batch // 2]]
+            ops += [(key, None, True) for key in chosen[batch // 2:]]
+            ops += [(key, 1, False) for key in chosen[batch // 2:]]
+            target.apply(ops)
+            batches[0] += 1
+            time.sleep(interval)
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / seconds, batches[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--keys', type=int, default=50000)
+    parser.add_argument('--readers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--batch', type=int, default=100, help='keys touched per writer batch')
+    parser.add_argument('--interval', type=float, default=0.01, help='seconds between batches')
+    args = parser.parse_args()
+
+    keys = ['key' + str(i) for i in range(args.keys)]
+    print(f"{'engine':<7}{'readers':>8}{'locked reads/s':>16}{'snapshot reads/s':>18}{'ratio':>8}"
+          f"{'batches':>10}")
+    for name, engine in ENGINES.items():
+        for readers in args.readers:
+            locked, locked_batches = run(LockedHashMap(engine), keys, readers, args.seconds,
+                                         args.batch, args.interval)
+            snapshot, snapshot_batches = run(SnapshotAdapter(engine), keys, readers, args.seconds,
+                                             args.batch, args.interval)
+            print(f"{name:<7}{readers:>8}{locked:>16.0f}{snapshot:>18.0f}{snapshot / locked:>7.2f}x"
+                  f"{snapshot_batches:>6}/{locked_batches}")
+
+
+if __name__ == "__main__":
+    main()
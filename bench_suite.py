@@ -0,0 +1,241 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Benchmark suite comparing the HashMap engines on scaled-up versions of the
+#              PDF scenarios: bulk put, hit- and miss-heavy get/contains_key, remove churn,
+#              resize_table sweeps, get_keys_and_values and find_mode. Reports ops/sec,
+#              p50/p99 per-op latency and peak traced memory, and can write the results
+#              as JSON so runs from different versions can be compared.
+#
+# Usage: python bench_suite.py [--size 5000] [--engines OA SC] [--output results.json]
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import hash_map_compact
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+
+ENGINES = {'OA': hash_map_oa, 'SC': hash_map_sc, 'OA-compact': hash_map_compact}
+FUNCTIONS = {'hash_function_1': hash_function_1, 'hash_function_2': hash_function_2}
+
+clock = time.perf_counter_ns
+
+
+def filled(module, function, size: int):
+    """Returns a map holding 'str0'..'str<size-1>', the keys of PDF put example 1."""
+    m = module.HashMap(53, function)
+    for i in range(size):
+        m.put('str' + str(i), i * 100)
+    return m
+
+
+# Each workload does its setup untimed and returns the latency of every timed operation (ns).
+
+def workload_put(module, function, size: int) -> list:
+    """PDF put example 1, scaled: insert size fresh keys starting from capacity 53."""
+    m = module.HashMap(53, function)
+    latencies = []
+    for i in range(size):
+        key = 'str' + str(i)
+        start = clock()
+        m.put(key, i * 100)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def workload_get_hit(module, function, size: int) -> list:
+    """PDF get example 2, scaled: look up keys that are all present."""
+    m = filled(module, function, size)
+    latencies = []
+    for i in range(size):
+        key = 'str' + str(i)
+        start = clock()
+        m.get(key)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def workload_get_miss(module, function, size: int) -> list:
+    """Look up keys that are all absent."""
+    m = filled(module, function, size)
+    latencies = []
+    for i in range(size):
+        key = 'miss' + str(i)
+        start = clock()
+        m.get(key)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def workload_contains_mixed(module, function, size: int) -> list:
+    """PDF contains_key example 2, scaled: alternate present and absent keys."""
+    m = filled(module, function, size)
+    latencies = []
+    for i in range(size):
+        key = 'str' + str(i) if i % 2 == 0 else 'str' + str(size + i)
+        start = clock()
+        m.contains_key(key)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def workload_remove_churn(module, function, size: int) -> list:
+    """Remove the oldest key and insert a new one, keeping size keys live."""
+    m = filled(module, function, size)
+    latencies = []
+    for i in range(size):
+        old_key, new_key = 'str' + str(i), 'str' + str(size + i)
+        start = clock()
+        m.remove(old_key)
+        m.put(new_key, i)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def workload_resize_sweep(module, function, size: int) -> list:
+    """PDF resize example 2, scaled: resize_table to a sweep of capacities."""
+    m = filled(module, function, size)
+    latencies = []
+    for capacity in range(size, size * 5, max(1, size // 5)):
+        start = clock()
+        m.resize_table(capacity)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def workload_keys_and_values(module, function, size: int) -> list:
+    """Materialize get_keys_and_values() a few times."""
+    m = filled(module, function, size)
+    latencies = []
+    for _ in range(10):
+        start = clock()
+        m.get_keys_and_values()
+        latencies.append(clock() - start)
+    return latencies
+
+
+def workload_find_mode(module, function, size: int) -> list:
+    """PDF find_mode example 2, scaled: values drawn from size // 10 distinct strings."""
+    da = DynamicArray([str(i * 7 % (size // 10 + 1)) for i in range(size)])
+    start = clock()
+    module.find_mode(da)
+    return [clock() - start]
+
+
+def workload_increment(module, function, size: int) -> list:
+    """Counting loop: increment() keys drawn from size // 10 distinct strings."""
+    m = module.HashMap(53, function)
+    latencies = []
+    for i in range(size):
+        key = 'str' + str(i * 7 % (size // 10 + 1))
+        start = clock()
+        m.increment(key)
+        latencies.append(clock() - start)
+    return latencies
+
+
+WORKLOADS = {
+    'put': workload_put,
+    'get_hit': workload_get_hit,
+    'get_miss': workload_get_miss,
+    'contains_mixed': workload_contains_mixed,
+    'remove_churn': workload_remove_churn,
+    'resize_sweep': workload_resize_sweep,
+    'get_keys_and_values': workload_keys_and_values,
+    'find_mode': workload_find_mode,
+    'increment': workload_increment,
+}
+
+
+def percentile(ordered: list, fraction: float) -> int:
+    """Returns the value at the given fraction of an ascending list."""
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def peak_memory(workload, module, function, size: int) -> int:
+    """Returns the peak traced allocation, in bytes, of running the workload once."""
+    tracemalloc.start()
+    workload(module, function, size)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run(engine: str, function_name: str, workload_name: str, size: int, memory: bool) -> dict:
+    """Runs one workload and returns its result record."""
+    module, function = ENGINES[engine], FUNCTIONS[function_name]
+    workload = WORKLOADS[workload_name]
+    latencies = sorted(workload(module, function, size))
+    total = sum(latencies)
+    return {
+        'engine': engine,
+        'function': function_name,
+        'workload': workload_name,
+        'size': size,
+        'ops': len(latencies),
+        'ops_per_sec': len(latencies) / (total / 1e9) if total else None,
+        'p50_us': percentile(latencies, 0.50) / 1e3,
+        'p99_us': percentile(latencies, 0.99) / 1e3,
+        'peak_bytes': peak_memory(workload, module, function, size) if memory else None,
+    }
+
+
+def git_revision() -> str:
+    """Returns the current git commit, or None outside a checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=5000, help='keys per workload')
+    parser.add_argument('--engines', nargs='+', default=['OA', 'SC'], choices=sorted(ENGINES))
+    parser.add_argument('--functions', nargs='+', default=sorted(FUNCTIONS), choices=sorted(FUNCTIONS))
+    parser.add_argument('--workloads', nargs='+', default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--output', help='write results to this JSON file')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'engine':<11}{'function':<17}{'workload':<21}{'ops/s':>11}{'p50 us':>10}{'p99 us':>10}{'peak KiB':>10}")
+    for engine in args.engines:
+        for function_name in args.functions:
+            for workload_name in args.workloads:
+                # find_mode lives in hash_map_sc only and always uses its default hash function.
+                if workload_name == 'find_mode' and (engine != 'SC' or function_name != 'hash_function_1'):
+                    continue
+                if workload_name == 'increment' and not hasattr(ENGINES[engine].HashMap, 'increment'):
+                    continue
+                result = run(engine, function_name, workload_name, args.size, not args.no_memory)
+                results.append(result)
+                peak = '' if result['peak_bytes'] is None else f"{result['peak_bytes'] / 1024:.0f}"
+                print(f"{engine:<11}{function_name:<17}{workload_name:<21}{result['ops_per_sec']:>11.0f}"
+                      f"{result['p50_us']:>10.1f}{result['p99_us']:>10.1f}{peak:>10}")
+
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'git_revision': git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'size': args.size,
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"\nwrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
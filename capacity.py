@@ -0,0 +1,202 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Capacity policies for the HashMaps (hash_map_sc.HashMap and hash_map_oa.HashMap).
+#              A policy decides which table sizes are allowed, how the table grows and
+#              shrinks, whether hashes are mixed before indexing, and the load factors at
+#              which the map resizes.
+
+from bisect import bisect_left
+
+_MASK_64 = (1 << 64) - 1
+
+# Smallest prime >= 2**k for k = 1..62, so PrimeLadderCapacity never tests a number for
+# primality: every resize is a lookup in this table.
+_PRIME_LADDER = (
+    2, 5, 11, 17, 37, 67, 131,
+    257, 521, 1031, 2053, 4099,
+    8209, 16411, 32771, 65537, 131101,
+    262147, 524309, 1048583, 2097169, 4194319,
+    8388617, 16777259, 33554467, 67108879, 134217757,
+    268435459, 536870923, 1073741827, 2147483659, 4294967311,
+    8589934609, 17179869209, 34359738421, 68719476767, 137438953481,
+    274877906951, 549755813911, 1099511627791, 2199023255579, 4398046511119,
+    8796093022237, 17592186044423, 35184372088891, 70368744177679, 140737488355333,
+    281474976710677, 562949953421381, 1125899906842679, 2251799813685269, 4503599627370517,
+    9007199254740997, 18014398509482143, 36028797018963971, 72057594037928017, 144115188075855881,
+    288230376151711813, 576460752303423619, 1152921504606847009, 2305843009213693967, 4611686018427388039,
+)
+
+
+def _is_prime(capacity: int) -> bool:
+    """Trial division, the same test the HashMaps' _is_prime() uses."""
+    if capacity == 2 or capacity == 3:
+        return True
+    if capacity < 2 or capacity % 2 == 0:
+        return False
+    factor = 3
+    while factor ** 2 <= capacity:
+        if capacity % factor == 0:
+            return False
+        factor += 2
+    return True
+
+
+def _next_prime(capacity: int) -> int:
+    """Smallest odd prime >= capacity, the same search the HashMaps' _next_prime() does."""
+    if capacity % 2 == 0:
+        capacity += 1
+    while not _is_prime(capacity):
+        capacity += 2
+    return capacity
+
+
+def mix_hash(hash_value: int) -> int:
+    """
+    Spreads the bits of a hash across its low bits (the 64-bit finalizer of MurmurHash3,
+    one multiply). Needed when the index is the low bits of the hash: sums of character
+    codes, object ids and small ints leave those bits badly distributed.
+    :param hash_value: Any int, negative ones included.
+    :return: Mixed hash in [0, 2**64).
+    """
+    hash_value = ((hash_value ^ (hash_value >> 33)) * 0xFF51AFD7ED558CCD) & _MASK_64
+    return hash_value ^ (hash_value >> 33)
+
+
+class CapacityPolicy:
+    """
+    Base class for capacity policies. Subclasses define round_up() and may override
+    grow()/shrink() and mix.
+    """
+
+    name = None
+    # 'prime' or 'power_of_two'; probing strategies that only cover one kind of table
+    # check this (see ProbingStrategy.capacity_kind).
+    capacity_kind = None
+    # Function applied to every hash before it is cached and used as an index, or None.
+    mix = None
+
+    def __init__(self, grow_at: float = None, shrink_at: float = None) -> None:
+        """
+        Initialize the policy.
+        :param grow_at: Load factor at which the table grows. None keeps the engine's
+                        default: 1.0 for separate chaining, 0.5 (probe load) for open addressing.
+        :param shrink_at: Load factor below which removing a key shrinks the table.
+                          None never shrinks. Must be below half of grow_at, so the
+                          halved table is not immediately full again.
+        """
+        if grow_at is not None and grow_at <= 0:
+            raise ValueError("grow_at must be positive")
+        if shrink_at is not None and shrink_at < 0:
+            raise ValueError("shrink_at must not be negative")
+        self.grow_at = grow_at
+        self.shrink_at = shrink_at
+
+    def __str__(self) -> str:
+        """Return the policy name."""
+        return self.name
+
+    def thresholds(self, default_grow_at: float) -> (float, float):
+        """
+        Resolve the load factors for one engine.
+        :param default_grow_at: The engine's load limit, used when grow_at is None.
+        :return: Tuple: (grow_at, shrink_at), shrink_at None if the table never shrinks.
+        """
+        grow_at = default_grow_at if self.grow_at is None else self.grow_at
+        if self.shrink_at is not None and self.shrink_at * 2 >= grow_at:
+            raise ValueError(f"shrink_at {self.shrink_at} must be below half of grow_at {grow_at}")
+        return grow_at, self.shrink_at
+
+    def hasher(self, function: callable) -> callable:
+        """
+        Return the function the map should hash keys with: function itself, or
+        function followed by mix.
+        """
+        mix = self.mix
+        if mix is None:
+            return function
+        return lambda key: mix(function(key))
+
+    def round_up(self, capacity: int) -> int:
+        """
+        Return the smallest allowed capacity >= capacity.
+        :param capacity: Requested capacity (>= 1).
+        :return: Allowed capacity.
+        """
+        raise NotImplementedError
+
+    def grow(self, capacity: int) -> int:
+        """Return the allowed capacity to grow to from capacity, about twice as large."""
+        return self.round_up(capacity * 2)
+
+    def shrink(self, capacity: int) -> int:
+        """Return the allowed capacity to shrink to from capacity, about half as large."""
+        return self.round_up(max(capacity // 2, 1))
+
+
+class PrimeCapacity(CapacityPolicy):
+    """
+    Prime capacities found by trial division, indexed with hash % capacity
+    (the HashMaps' original behavior).
+    """
+
+    name = 'prime'
+    capacity_kind = 'prime'
+
+    def round_up(self, capacity: int) -> int:
+        """Smallest prime >= capacity."""
+        if _is_prime(capacity):
+            return capacity
+        return _next_prime(capacity)
+
+    def grow(self, capacity: int) -> int:
+        """Smallest prime above twice capacity."""
+        return _next_prime(capacity * 2)
+
+
+class PrimeLadderCapacity(CapacityPolicy):
+    """
+    Prime capacities taken from a precomputed ladder (one prime per power of two),
+    so a resize is a binary search instead of trial division.
+    """
+
+    name = 'prime_ladder'
+    capacity_kind = 'prime'
+
+    def round_up(self, capacity: int) -> int:
+        """Smallest ladder prime >= capacity."""
+        position = bisect_left(_PRIME_LADDER, capacity)
+        if position == len(_PRIME_LADDER):
+            raise ValueError(f"capacity {capacity} is beyond the prime ladder")
+        return _PRIME_LADDER[position]
+
+    def grow(self, capacity: int) -> int:
+        """The next rung above capacity."""
+        return self.round_up(capacity + 1)
+
+    def shrink(self, capacity: int) -> int:
+        """The rung below capacity."""
+        return _PRIME_LADDER[max(bisect_left(_PRIME_LADDER, capacity) - 1, 0)]
+
+
+class PowerOfTwoCapacity(CapacityPolicy):
+    """
+    Power-of-two capacities. Hashes go through mix_hash() first, so the index
+    hash % capacity is just the mixed hash's low bits and no key ends up in a bucket
+    only because its hash lacks low-bit entropy.
+    """
+
+    name = 'power_of_two'
+    capacity_kind = 'power_of_two'
+    mix = staticmethod(mix_hash)
+
+    def round_up(self, capacity: int) -> int:
+        """Smallest power of two >= capacity."""
+        return 1 << max(capacity - 1, 0).bit_length()
+
+    def grow(self, capacity: int) -> int:
+        """Twice capacity."""
+        return capacity * 2
+
+    def shrink(self, capacity: int) -> int:
+        """Half of capacity."""
+        return max(capacity // 2, 1)
@@ -0,0 +1,197 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Thread-safe hashmap built from independent shards. Keys are hash-partitioned
+#              across N HashMaps (separate chaining or open addressing), each guarded by its
+#              own lock, so threads working on different shards never wait for each other and
+#              a resize only ever locks one shard.
+
+from threading import Lock
+
+import hash_map_sc
+from a6_include import DynamicArray, hash_function_1
+
+_MASK_64 = (1 << 64) - 1
+_GOLDEN_64 = 0x9E3779B97F4A7C15
+
+
+class ShardedHashMap:
+    def __init__(self, shards: int = 16, capacity: int = 11, function: callable = hash_function_1,
+                 engine=hash_map_sc.HashMap) -> None:
+        """
+        Initialize a map of `shards` independent HashMaps.
+        :param shards: Number of shards (and locks).
+        :param capacity: Initial capacity of each shard.
+        :param function: Hash function used for keys inside each shard.
+        :param engine: HashMap class for the shards, e.g. hash_map_sc.HashMap or hash_map_oa.HashMap.
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self._shards = [engine(capacity, function) for _ in range(shards)]
+        self._locks = [Lock() for _ in range(shards)]
+
+    def __str__(self) -> str:
+        """Override string method to show each shard in turn."""
+        out = ''
+        for index in range(len(self._shards)):
+            with self._locks[index]:
+                out += f"shard {index}:\n{self._shards[index]}"
+        return out
+
+    def _shard_index(self, key: str) -> int:
+        """
+        Picks the shard for key. Uses Python's hash() rather than the shards' hash function,
+        so the (pure Python) hash function runs once per operation, inside the shard; the
+        shard only has to be the same for a key within this process. The hash is scrambled
+        first so the shard number and the bucket index inside the shard are not correlated.
+        :param key: Key to place.
+        :return: Shard index.
+        """
+        return (((hash(key) * _GOLDEN_64) & _MASK_64) >> 32) % len(self._shards)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the map, locking only the key's shard.
+        :param key: Key to be added/updated.
+        :param value: Value to associate with key.
+        :return: None
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            self._shards[index].put(key, value)
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        :param key: Key to search for.
+        :return: Value or None.
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            return self._shards[index].get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Boolean if key is within hash map.
+        :param key: Key to be searched for.
+        :return: Boolean
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            return self._shards[index].contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the key and its associated value from the map.
+        :param key: Key to be removed.
+        :return: None
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            self._shards[index].remove(key)
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Returns the value of key, first adding key with the default value if it is absent.
+        The lookup and the insert happen under one hold of the shard lock.
+        :param key: Key to look up.
+        :param default: Value stored when key is absent.
+        :return: Value now associated with key.
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            return self._shards[index].setdefault(key, default)
+
+    def get_or_insert(self, key: str, factory: callable) -> object:
+        """
+        Returns the value of key, first adding key with factory() if it is absent.
+        factory runs while the shard lock is held.
+        :param key: Key to look up.
+        :param factory: Zero-argument callable that makes the value for a new key.
+        :return: Value now associated with key.
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            return self._shards[index].get_or_insert(key, factory)
+
+    def compute(self, key: str, fn: callable) -> object:
+        """
+        Replaces the value of key with fn(current value) atomically; see HashMap.compute.
+        fn runs while the shard lock is held.
+        :param key: Key to update.
+        :param fn: One-argument callable computing the new value.
+        :return: The new value, or None if the key was removed.
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            return self._shards[index].compute(key, fn)
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Adds delta to the number stored under key atomically, starting from 0.
+        :param key: Key to count.
+        :param delta: Amount to add.
+        :return: The new count.
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            return self._shards[index].increment(key, delta)
+
+    def pop(self, key: str, default: object = None) -> object:
+        """
+        Removes key and returns its value, or returns default if key is absent.
+        :param key: Key to remove.
+        :param default: Value returned when key is absent.
+        :return: Removed value or default.
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            return self._shards[index].pop(key, default)
+
+    def clear(self) -> None:
+        """
+        Clears every shard, one at a time.
+        :return: None
+        """
+        for index in range(len(self._shards)):
+            with self._locks[index]:
+                self._shards[index].clear()
+
+    def get_size(self) -> int:
+        """
+        Returns the number of entries across all shards. Shards are read one after another,
+        so with concurrent writers this is a sum of per-shard snapshots, not one global one.
+        :return: Size of map
+        """
+        return sum(shard.get_size() for shard in self._shards)
+
+    def get_capacity(self) -> int:
+        """
+        Returns the total capacity across all shards.
+        :return: Capacity of map
+        """
+        return sum(shard.get_capacity() for shard in self._shards)
+
+    def table_load(self) -> float:
+        """
+        Returns the load over all shards: total entries / total capacity.
+        :return: Float of table load.
+        """
+        return float(self.get_size() / self.get_capacity())
+
+    def shard_count(self) -> int:
+        """
+        Returns the number of shards.
+        :return: Shard count
+        """
+        return len(self._shards)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a DA of (key, value) tuples from every shard, each shard read under its lock.
+        :return: Dynamic Array of Tuples: (Key, Value).
+        """
+        kv_da = DynamicArray()
+        for index in range(len(self._shards)):
+            with self._locks[index]:
+                kv_da.extend(self._shards[index].get_keys_and_values())
+        return kv_da
@@ -0,0 +1,335 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Open addressing hashmap with quadratic probing, stored as parallel flat
+#              arrays (keys, values, cached hashes, slot states) instead of one
+#              HashEntry object per slot. Same public API as hash_map_oa.HashMap.
+
+from array import array
+
+from a6_include import DynamicArray, HashEntry, hash_function_1, hash_function_2
+
+# Slot states, one byte each in HashMap._states.
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+# Cached hashes are stored as unsigned 64-bit values; every index is computed from the
+# masked hash so resizes can reuse the cache without calling the hash function.
+_HASH_MASK = (1 << 64) - 1
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses quadratic probing for collision resolution
+        and stores its slots as parallel arrays.
+        :param capacity: Initial capacity, rounded up to a prime.
+        :param function: Hash function used for keys.
+        """
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+        self._allocate(self._capacity)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as hash_map_oa.HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                is_tombstone = self._states[i] == _TOMBSTONE
+                out += f"{i}: K: {self._keys[i]} V: {self._values[i]} TS: {is_tombstone}\n"
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replaces the slot arrays with empty ones of the given capacity.
+        :param capacity: Number of slots.
+        :return: None
+        """
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+
+    def _probe(self, key: str, hash_value: int) -> (int, bool):
+        """
+        Quadratic probe for the given key. Cached hashes are compared before keys,
+        so most occupied slots are skipped without a string comparison.
+        :param key: Key to search for.
+        :param hash_value: Masked hash of key.
+        :return: Tuple: (index of the live slot, True) if the key is present, otherwise
+                 (index of the first tombstone or empty slot on the probe path, False).
+        """
+        states = self._states
+        hashes = self._hashes
+        keys = self._keys
+        capacity = self._capacity
+        initial_index = hash_value % capacity
+        index = initial_index
+        free = None
+        count = 1
+        # Quadratic Probing Loop
+        state = states[index]
+        while state != _EMPTY and count <= capacity:
+            if state == _TOMBSTONE:
+                if free is None:
+                    free = index
+            elif hashes[index] == hash_value and keys[index] == key:
+                return index, True
+            index = (initial_index + count**2) % capacity
+            count += 1
+            state = states[index]
+        if free is None:
+            free = index
+        return free, False
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the map. If key exists, update its value. Otherwise, add pair.
+        :param key: Key to be added/updated.
+        :param value: Value to associate with key.
+        :return: None
+        """
+        # Check if resize needed. Tombstones count toward the limit; when they outnumber
+        # live entries, rebuilding at the same capacity clears them without growing the table.
+        if (self._size + self._tombstones) / self._capacity >= 0.5:
+            if self._tombstones > self._size:
+                self.resize_table(self._capacity)
+            else:
+                self.resize_table(self._capacity*2)
+        hash_value = self._hash_function(key) & _HASH_MASK
+        index, found = self._probe(key, hash_value)
+        if not found:
+            if self._states[index] == _TOMBSTONE:
+                self._tombstones -= 1
+            self._states[index] = _LIVE
+            self._keys[index] = key
+            self._hashes[index] = hash_value
+            self._size += 1
+        self._values[index] = value
+
+    def table_load(self) -> float:
+        """
+        Returns the table load
+        :return: Float of table load.
+        """
+        return float(self._size/self._capacity)
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty slots in the hash table.
+        :return: Number of empty slots
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def tombstones(self) -> int:
+        """
+        Returns the number of tombstones in the hash table.
+        :return: Number of tombstones
+        """
+        return self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the hash table. Entries are moved using their cached
+        hashes, so the hash function is not called again.
+        :param new_capacity: New capacity to be used
+        :return: None
+        """
+        # Make sure new capacity is a valid size.
+        if new_capacity < self._size:
+            return
+
+        # Make sure the new capacity is a valid prime number.
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        # Keep doubling until the last entry would be placed below the 0.5 load limit.
+        while (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._next_prime(new_capacity*2)
+
+        old_keys, old_values = self._keys, self._values
+        old_hashes, old_states = self._hashes, self._states
+        self._capacity = new_capacity
+        self._tombstones = 0
+        self._allocate(new_capacity)
+
+        keys, values, hashes, states = self._keys, self._values, self._hashes, self._states
+        index = old_states.find(_LIVE)
+        while index != -1:
+            hash_value = old_hashes[index]
+            initial_index = hash_value % new_capacity
+            new_index = initial_index
+            count = 1
+            while states[new_index] != _EMPTY:
+                new_index = (initial_index + count**2) % new_capacity
+                count += 1
+            states[new_index] = _LIVE
+            keys[new_index] = old_keys[index]
+            values[new_index] = old_values[index]
+            hashes[new_index] = hash_value
+            index = old_states.find(_LIVE, index + 1)
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        :param key: Key to search for.
+        :return: Value or None.
+        """
+        index, found = self._probe(key, self._hash_function(key) & _HASH_MASK)
+        if found:
+            return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Boolean if key is within hash map.
+        :param key: Key to be searched for.
+        :return: Boolean
+        """
+        return self._probe(key, self._hash_function(key) & _HASH_MASK)[1]
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the key and its associated value from the hash map, leaving behind a tombstone.
+        :param key: Key to be removed.
+        :return: None
+        """
+        index, found = self._probe(key, self._hash_function(key) & _HASH_MASK)
+        if not found:
+            return
+        # Drop the references so the key and value can be collected; the slot stays a tombstone.
+        self._states[index] = _TOMBSTONE
+        self._keys[index] = None
+        self._values[index] = None
+        self._size -= 1
+        self._tombstones += 1
+
+    def clear(self) -> None:
+        """
+        Clears every slot, keeping the underlying capacity.
+        :return: None
+        """
+        self._size = 0
+        self._tombstones = 0
+        self._allocate(self._capacity)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a DA where each index contains a tuple of key/value pairs stored in the hashmap.
+        :return: Dynamic Array of Tuples: (Key, Value).
+        """
+        kv_da = DynamicArray()
+        states = self._states
+        index = states.find(_LIVE)
+        while index != -1:
+            kv_da.append((self._keys[index], self._values[index]))
+            index = states.find(_LIVE, index + 1)
+        return kv_da
+
+    def __iter__(self):
+        """
+        Yields a HashEntry for each live slot, built on the fly since no entry objects are stored.
+        :return: Generator of HashEntry objects.
+        """
+        states = self._states
+        index = states.find(_LIVE)
+        while index != -1:
+            yield HashEntry(self._keys[index], self._values[index])
+            index = states.find(_LIVE, index + 1)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nPDF - resize example 2")
+    print("----------------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(25, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nPDF - __iter__(), __next__() example 2")
+    print("---------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
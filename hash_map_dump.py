@@ -0,0 +1,219 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Binary dump format shared by hash_map_sc.HashMap.dump/load and
+#              hash_map_oa.HashMap.dump/load.
+#
+# File layout:
+#   header  struct _HEADER: magic, format version, engine kind (b'S' or b'O'), capacity, size,
+#           longest chain/probe, then a flags byte (UNSTABLE_HASHES), then the hash function
+#           id and the layout (capacity policy name, preceded for OA by the probing strategy
+#           name) as length-prefixed UTF-8 strings. Version 1 dumps have no flags byte.
+#   chunks  length-prefixed pickles, each a list of up to _CHUNK_ENTRIES
+#           (bucket index, cached hash, key, value) tuples in bucket order; OA tombstones
+#           are written with hash, key and value None, and OA entries an incremental resize
+#           has not moved yet come last with index None. A zero length ends the file.
+#
+# Keys and values are limited to built-in data types: None, bool, int, float, complex, str,
+# bytes, bytearray and tuples, lists, dicts, sets and frozensets of them. dump() refuses
+# anything else, and read_chunks() unpickles with an Unpickler that cannot import any other
+# class or function, so loading a dump from an untrusted source cannot run code.
+
+import io
+import pickle
+import struct
+
+_MAGIC = b'A6HMDUMP'
+_VERSION = 2
+
+_HEADER = struct.Struct('<8sIcQQQ')
+_LENGTH = struct.Struct('<I')
+_FLAGS = struct.Struct('<B')
+
+# Header flag: some key's hash depends on the process that wrote the dump (see
+# a6_include.key_hash_is_stable()), so load() must hash every key again.
+UNSTABLE_HASHES = 1
+
+# Keys per load() re-hashes from the first chunk before trusting the stored hashes.
+_SAMPLE_ENTRIES = 32
+
+# Entries per pickled chunk; load() holds at most one chunk besides the map itself.
+_CHUNK_ENTRIES = 4096
+
+
+# The only globals a chunk may refer to: pickle stores a complex as a call to complex().
+_SAFE_GLOBALS = {('builtins', 'complex'): complex}
+
+
+class DumpFormatException(Exception):
+    pass
+
+
+class _DataPickler(pickle.Pickler):
+    """Pickler that refuses every object that is not built-in data."""
+
+    def reducer_override(self, obj):
+        """
+        Called for every object pickle has no opcode of its own for (so never for
+        int, float, str, bytes, tuples, lists, dicts, sets or frozensets).
+        """
+        if type(obj) is complex or obj is complex:
+            return NotImplemented
+        raise DumpFormatException(f"cannot dump {type(obj).__name__} objects: keys and values "
+                                  f"must be built-in data types")
+
+
+class _DataUnpickler(pickle.Unpickler):
+    """Unpickler that cannot import anything but _SAFE_GLOBALS."""
+
+    def find_class(self, module: str, name: str):
+        """Returns an allowed global, refusing every other one."""
+        try:
+            return _SAFE_GLOBALS[(module, name)]
+        except KeyError:
+            raise DumpFormatException(f"hash map dump refers to {module}.{name}, "
+                                      f"which is not a built-in data type") from None
+
+
+def dumps_data(obj: object) -> bytes:
+    """
+    Pickles obj, refusing anything that is not built-in data (see the module header).
+    :param obj: Object to pickle.
+    :return: Pickle bytes.
+    """
+    buffer = io.BytesIO()
+    _DataPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+
+def loads_data(data: bytes) -> object:
+    """
+    Unpickles bytes written by dumps_data() without importing anything, so untrusted
+    bytes cannot run code.
+    :param data: Pickle bytes.
+    :return: Unpickled object.
+    """
+    try:
+        return _DataUnpickler(io.BytesIO(data)).load()
+    except (pickle.UnpicklingError, EOFError, ValueError) as error:
+        raise DumpFormatException(f"corrupt pickled data: {error}") from None
+
+
+def write_header(file, kind: bytes, capacity: int, size: int, longest: int, function_id: str,
+                 layout: str = '', flags: int = 0) -> None:
+    """
+    Writes the dump header.
+    :param file: Binary file open for writing.
+    :param kind: b'S' for separate chaining, b'O' for open addressing.
+    :param capacity: Bucket array capacity.
+    :param size: Number of live entries.
+    :param longest: Longest chain (SC) or probe (OA).
+    :param function_id: a6_include.hash_function_id() of the hash function ('' if it has none).
+    :param layout: Names of what else decides where entries sit: the capacity policy,
+                   and for OA the probing strategy.
+    :param flags: UNSTABLE_HASHES or 0.
+    :return: None
+    """
+    file.write(_HEADER.pack(_MAGIC, _VERSION, kind, capacity, size, longest))
+    file.write(_FLAGS.pack(flags))
+    for text in (function_id, layout):
+        data = text.encode()
+        file.write(_LENGTH.pack(len(data)))
+        file.write(data)
+
+
+def read_header(file, kind: bytes) -> (int, int, int, str, str, int):
+    """
+    Reads and checks the dump header.
+    :param file: Binary file open for reading, positioned at the start of a dump.
+    :param kind: Engine kind the caller expects.
+    :return: Tuple: (capacity, size, longest, function id, layout, flags). A version 1 dump
+             gets flags UNSTABLE_HASHES, since nothing recorded whether its hashes were.
+    """
+    data = file.read(_HEADER.size)
+    if len(data) != _HEADER.size:
+        raise DumpFormatException("truncated hash map dump")
+    magic, version, file_kind, capacity, size, longest = _HEADER.unpack(data)
+    if magic != _MAGIC or version not in (1, _VERSION):
+        raise DumpFormatException(f"not a version 1 or {_VERSION} hash map dump")
+    if file_kind != kind:
+        raise DumpFormatException(f"dump is for engine {file_kind.decode()}, not {kind.decode()}")
+    if version == 1:
+        flags = UNSTABLE_HASHES
+    else:
+        data = file.read(_FLAGS.size)
+        if len(data) != _FLAGS.size:
+            raise DumpFormatException("truncated hash map dump")
+        flags = _FLAGS.unpack(data)[0]
+    function_id = _read_block(file).decode()
+    layout = _read_block(file).decode()
+    return capacity, size, longest, function_id, layout, flags
+
+
+def hashes_match(chunk: list, hash_function: callable) -> bool:
+    """
+    Re-hashes up to _SAMPLE_ENTRIES keys spread over a chunk and compares them with the
+    stored hashes, so a dump is not trusted just because its hash function id matches.
+    :param chunk: List of (bucket index, cached hash, key, value) tuples from read_chunks().
+    :param hash_function: The loading map's hash function (with its mixer, if any).
+    :return: True if every sampled hash matches.
+    """
+    entries = [entry for entry in chunk if entry[1] is not None]
+    step = max(len(entries) // _SAMPLE_ENTRIES, 1)
+    for _, hash_value, key, _ in entries[::step]:
+        if hash_function(key) != hash_value:
+            return False
+    return True
+
+
+def _read_block(file) -> bytes:
+    """Reads one length-prefixed block."""
+    data = file.read(_LENGTH.size)
+    if len(data) != _LENGTH.size:
+        raise DumpFormatException("truncated hash map dump")
+    length = _LENGTH.unpack(data)[0]
+    block = file.read(length)
+    if len(block) != length:
+        raise DumpFormatException("truncated hash map dump")
+    return block
+
+
+class ChunkWriter:
+    """Buffers entries and writes them out _CHUNK_ENTRIES at a time."""
+
+    def __init__(self, file) -> None:
+        """Start writing chunks to a binary file positioned after the header."""
+        self._file = file
+        self._entries = []
+
+    def write(self, index: int, hash_value: int, key: object, value: object) -> None:
+        """Adds one entry, flushing a full chunk."""
+        self._entries.append((index, hash_value, key, value))
+        if len(self._entries) == _CHUNK_ENTRIES:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Writes the buffered entries as one chunk."""
+        data = dumps_data(self._entries)
+        self._file.write(_LENGTH.pack(len(data)))
+        self._file.write(data)
+        self._entries = []
+
+    def close(self) -> None:
+        """Writes any remaining entries and the end marker."""
+        if self._entries:
+            self._flush()
+        self._file.write(_LENGTH.pack(0))
+
+
+def read_chunks(file):
+    """
+    Generator over the chunks of a dump, one list of
+    (bucket index, cached hash, key, value) tuples at a time.
+    Chunks can only hold built-in data types, so a crafted dump cannot run code.
+    :param file: Binary file positioned after the header.
+    """
+    while True:
+        data = _read_block(file)
+        if not data:
+            return
+        yield loads_data(data)
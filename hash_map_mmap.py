@@ -0,0 +1,505 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Persistent open addressing hashmap with quadratic probing, stored in one
+#              fixed-layout file and accessed through mmap. Opening an existing file only
+#              maps it, lookups page in just the slots and records they touch, and several
+#              processes can map the same file read-only.
+#
+# File layout (little-endian):
+#   header  _HEADER_SIZE bytes: magic, format version, capacity, size, tombstones,
+#           end of the used heap, and the name of the hash function the slots were built with
+#   slots   capacity * _SLOT.size bytes: (hash, key offset, value offset, state)
+#   heap    length-prefixed records: keys as UTF-8, values pickled with hash_map_dump's
+#           data-only pickler (built-in data types only, so reading a file someone else
+#           wrote cannot run code). Updates append a new value record; resize_table()
+#           rewrites the file and drops unused records.
+
+import mmap
+import os
+import struct
+
+import hash_map_dump
+from a6_include import DynamicArray, hash_function_fnv1a, hash_function_id
+
+_MAGIC = b'A6HMMAP\x00'
+_VERSION = 1
+
+_HEADER = struct.Struct('<8sIQQQQ64s')
+_HEADER_SIZE = 128
+_SLOT = struct.Struct('<QQQB7x')
+_RECORD_LENGTH = struct.Struct('<I')
+
+# Room left for records when a file is created; the heap then doubles as needed.
+_INITIAL_HEAP = 4096
+
+# Slot states.
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+# Hashes are stored as unsigned 64-bit values, and every index is computed from the masked hash.
+_HASH_MASK = (1 << 64) - 1
+
+
+class MmapHashMapException(Exception):
+    pass
+
+
+class HashMap:
+    def __init__(self, path: str, capacity: int = 11, function=hash_function_fnv1a,
+                 readonly: bool = False) -> None:
+        """
+        Open the map stored at path, creating an empty one if the file does not exist.
+        The hash function must give the same result in every process, so Python's
+        built-in (salted) hash() cannot be used.
+        :param path: File holding the table.
+        :param capacity: Initial capacity, rounded up to a prime, when the file is created.
+        :param function: Hash function used for keys; must match the one the file was built with.
+        :param readonly: Map the file read-only; put/remove/clear/resize_table then raise.
+        """
+        if not hash_function_id(function):
+            raise MmapHashMapException("the hash function must be a named module-level function "
+                                       "(see a6_include.hash_function_id())")
+        self._path = path
+        self._hash_function = function
+        self._readonly = readonly
+        if not readonly and not os.path.exists(path):
+            self._create(path, self._next_prime(capacity), _INITIAL_HEAP, function)
+        self._open()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as hash_map_oa.HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            _, key_offset, value_offset, state = self._read_slot(i)
+            if state == _EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                key, value = self._read_key(key_offset), self._read_value(value_offset)
+                out += f"{i}: K: {key} V: {value} TS: {state == _TOMBSTONE}\n"
+        return out
+
+    def __enter__(self) -> "HashMap":
+        """Context manager entry: the map is already open."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Context manager exit: flush and close the file."""
+        self.close()
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _create(path: str, capacity: int, heap_bytes: int, function) -> None:
+        """
+        Writes an empty table file: header, capacity zeroed (empty) slots, and heap space.
+        :param path: File to create or overwrite.
+        :param capacity: Number of slots.
+        :param heap_bytes: Bytes to reserve for records.
+        :param function: Hash function recorded in the header.
+        :return: None
+        """
+        heap_start = _HEADER_SIZE + capacity * _SLOT.size
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, capacity, 0, 0, heap_start,
+                                    hash_function_id(function).encode()))
+            file.truncate(heap_start + heap_bytes)
+
+    def _open(self) -> None:
+        """
+        Maps the file and loads the header fields, checking the format and hash function.
+        :return: None
+        """
+        self._file = open(self._path, 'rb' if self._readonly else 'r+b')
+        access = mmap.ACCESS_READ if self._readonly else mmap.ACCESS_WRITE
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=access)
+        magic, version, capacity, size, tombstones, heap_end, function_id = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise MmapHashMapException(f"{self._path} is not a version {_VERSION} hash map file")
+        function_id = function_id.rstrip(b'\x00').decode()
+        # Files written before ids were qualified by module record the bare function name.
+        if function_id == self._hash_function.__name__ and getattr(self._hash_function, 'seed', None) is None:
+            function_id = hash_function_id(self._hash_function)
+        if function_id != hash_function_id(self._hash_function):
+            self.close()
+            raise MmapHashMapException(f"{self._path} was built with {function_id}, "
+                                       f"not {hash_function_id(self._hash_function)}")
+        self._capacity = capacity
+        self._size = size
+        self._tombstones = tombstones
+        self._heap_end = heap_end
+        self._function_id = function_id.encode()
+
+    def _write_header(self) -> None:
+        """
+        Stores the counters in the header.
+        :return: None
+        """
+        _HEADER.pack_into(self._mm, 0, _MAGIC, _VERSION, self._capacity, self._size,
+                          self._tombstones, self._heap_end, self._function_id)
+
+    def _check_writable(self) -> None:
+        """
+        Raises if the map was opened read-only.
+        :return: None
+        """
+        if self._readonly:
+            raise MmapHashMapException(f"{self._path} is open read-only")
+
+    def _read_slot(self, index: int) -> (int, int, int, int):
+        """
+        Reads one slot.
+        :param index: Slot index.
+        :return: Tuple: (hash, key offset, value offset, state).
+        """
+        return _SLOT.unpack_from(self._mm, _HEADER_SIZE + index * _SLOT.size)
+
+    def _write_slot(self, index: int, hash_value: int, key_offset: int, value_offset: int,
+                    state: int) -> None:
+        """
+        Writes one slot.
+        :return: None
+        """
+        _SLOT.pack_into(self._mm, _HEADER_SIZE + index * _SLOT.size, hash_value, key_offset,
+                        value_offset, state)
+
+    def _read_record(self, offset: int) -> bytes:
+        """
+        Returns the bytes of the heap record at offset.
+        :param offset: File offset of the record's length prefix.
+        :return: Record bytes
+        """
+        length = _RECORD_LENGTH.unpack_from(self._mm, offset)[0]
+        start = offset + _RECORD_LENGTH.size
+        return self._mm[start:start + length]
+
+    def _read_key(self, offset: int) -> str:
+        """Returns the key stored in the record at offset."""
+        return self._read_record(offset).decode()
+
+    def _read_value(self, offset: int) -> object:
+        """Returns the value stored in the record at offset."""
+        try:
+            return hash_map_dump.loads_data(self._read_record(offset))
+        except hash_map_dump.DumpFormatException as error:
+            raise MmapHashMapException(f"{self._path}: bad value record at {offset}: {error}") from None
+
+    def _append_record(self, data: bytes) -> int:
+        """
+        Appends a record to the heap, growing the file (doubling it) when it is full.
+        :param data: Record bytes.
+        :return: File offset of the new record.
+        """
+        offset = self._heap_end
+        end = offset + _RECORD_LENGTH.size + len(data)
+        if end > len(self._mm):
+            file_size = max(end, 2 * len(self._mm))
+            self._mm.flush()
+            self._mm.close()
+            self._file.truncate(file_size)
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE)
+        _RECORD_LENGTH.pack_into(self._mm, offset, len(data))
+        self._mm[offset + _RECORD_LENGTH.size:end] = data
+        self._heap_end = end
+        return offset
+
+    def _probe(self, key: str, hash_value: int) -> (int, bool):
+        """
+        Quadratic probe for the given key. Stored hashes are compared before keys, so
+        colliding slots are skipped without reading their key record.
+        :param key: Key to search for.
+        :param hash_value: Masked hash of key.
+        :return: Tuple: (index of the live slot, True) if the key is present, otherwise
+                 (index of the first tombstone or empty slot on the probe path, False).
+        """
+        read_slot = self._read_slot
+        capacity = self._capacity
+        key_bytes = None
+        initial_index = hash_value % capacity
+        index = initial_index
+        free = None
+        count = 1
+        slot_hash, key_offset, _, state = read_slot(index)
+        while state != _EMPTY and count <= capacity:
+            if state == _TOMBSTONE:
+                if free is None:
+                    free = index
+            elif slot_hash == hash_value:
+                if key_bytes is None:
+                    key_bytes = key.encode()
+                if self._read_record(key_offset) == key_bytes:
+                    return index, True
+            index = (initial_index + count**2) % capacity
+            count += 1
+            slot_hash, key_offset, _, state = read_slot(index)
+        if free is None:
+            free = index
+        return free, False
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the map. If key exists, update its value. Otherwise, add pair.
+        :param key: Key to be added/updated.
+        :param value: Value to associate with key; must be built-in data (see hash_map_dump).
+        :return: None
+        """
+        self._check_writable()
+        try:
+            data = hash_map_dump.dumps_data(value)
+        except hash_map_dump.DumpFormatException as error:
+            raise MmapHashMapException(str(error)) from None
+        # Check if resize needed. Tombstones count toward the limit; when they outnumber
+        # live entries, rebuilding at the same capacity clears them without growing the table.
+        if (self._size + self._tombstones) / self._capacity >= 0.5:
+            if self._tombstones > self._size:
+                self.resize_table(self._capacity)
+            else:
+                self.resize_table(self._capacity*2)
+        hash_value = self._hash_function(key) & _HASH_MASK
+        index, found = self._probe(key, hash_value)
+        value_offset = self._append_record(data)
+        if found:
+            key_offset = self._read_slot(index)[1]
+        else:
+            key_offset = self._append_record(key.encode())
+            if self._read_slot(index)[3] == _TOMBSTONE:
+                self._tombstones -= 1
+            self._size += 1
+        self._write_slot(index, hash_value, key_offset, value_offset, _LIVE)
+        self._write_header()
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        :param key: Key to search for.
+        :return: Value or None.
+        """
+        index, found = self._probe(key, self._hash_function(key) & _HASH_MASK)
+        if found:
+            return self._read_value(self._read_slot(index)[2])
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Boolean if key is within hash map.
+        :param key: Key to be searched for.
+        :return: Boolean
+        """
+        return self._probe(key, self._hash_function(key) & _HASH_MASK)[1]
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the key and its associated value from the hash map, leaving behind a tombstone.
+        :param key: Key to be removed.
+        :return: None
+        """
+        self._check_writable()
+        index, found = self._probe(key, self._hash_function(key) & _HASH_MASK)
+        if found:
+            hash_value, key_offset, value_offset, _ = self._read_slot(index)
+            self._write_slot(index, hash_value, key_offset, value_offset, _TOMBSTONE)
+            self._size -= 1
+            self._tombstones += 1
+            self._write_header()
+
+    def clear(self) -> None:
+        """
+        Empties the map, keeping the current capacity.
+        :return: None
+        """
+        self._check_writable()
+        self._rewrite(self._capacity, keep_entries=False)
+
+    def table_load(self) -> float:
+        """
+        Returns the table load
+        :return: Float of table load.
+        """
+        return float(self._size/self._capacity)
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty slots. Tombstones are not empty.
+        :return: Number of empty buckets
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def tombstones(self) -> int:
+        """
+        Returns the number of tombstones in the hash table.
+        :return: Number of tombstones
+        """
+        return self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the hash table. The file is rewritten next to the old one
+        with only live entries and their current records, then renamed over it, so a
+        crash part way leaves the old file intact. Processes that still have the old file
+        mapped keep reading the old version until they reopen it.
+        :param new_capacity: New capacity to be used
+        :return: None
+        """
+        self._check_writable()
+        # Make sure new capacity is a valid size.
+        if new_capacity < self._size:
+            return
+
+        # Make sure the new capacity is a valid prime number.
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        # Keep doubling until the last entry would be placed below the 0.5 load limit,
+        # the same capacity re-inserting everything through put() would settle on.
+        while (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._next_prime(new_capacity*2)
+
+        self._rewrite(new_capacity, keep_entries=True)
+
+    def _rewrite(self, new_capacity: int, keep_entries: bool) -> None:
+        """
+        Builds a new file with new_capacity slots, copies the live entries across if asked
+        (placed by stored hash, with no key comparisons), and swaps it in.
+        :param new_capacity: Capacity of the new file.
+        :param keep_entries: False to leave the new file empty.
+        :return: None
+        """
+        tmp_path = self._path + '.resize'
+        heap_bytes = max(_INITIAL_HEAP, self._heap_end - _HEADER_SIZE - self._capacity * _SLOT.size)
+        self._create(tmp_path, new_capacity, heap_bytes if keep_entries else _INITIAL_HEAP,
+                     self._hash_function)
+        new_map = HashMap(tmp_path, new_capacity, self._hash_function)
+        if keep_entries:
+            for i in range(self._capacity):
+                hash_value, key_offset, value_offset, state = self._read_slot(i)
+                if state == _LIVE:
+                    new_map._place(hash_value, self._read_record(key_offset),
+                                   self._read_record(value_offset))
+            new_map._write_header()
+        new_map.close()
+        self.close()
+        os.replace(tmp_path, self._path)
+        self._open()
+
+    def _place(self, hash_value: int, key_bytes: bytes, value_bytes: bytes) -> None:
+        """
+        Stores a key known to be absent in the first empty slot on its probe path.
+        :param hash_value: Masked hash of the key.
+        :param key_bytes: Encoded key record.
+        :param value_bytes: Pickled value record.
+        :return: None
+        """
+        capacity = self._capacity
+        initial_index = hash_value % capacity
+        index = initial_index
+        count = 1
+        while self._read_slot(index)[3] != _EMPTY:
+            index = (initial_index + count**2) % capacity
+            count += 1
+        self._write_slot(index, hash_value, self._append_record(key_bytes),
+                         self._append_record(value_bytes), _LIVE)
+        self._size += 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a DA where each index contains a tuple of key/value pairs stored in the hashmap.
+        :return: Dynamic Array of Tuples: (Key, Value).
+        """
+        kv_da = DynamicArray()
+        for i in range(self._capacity):
+            _, key_offset, value_offset, state = self._read_slot(i)
+            if state == _LIVE:
+                kv_da.append((self._read_key(key_offset), self._read_value(value_offset)))
+        return kv_da
+
+    def flush(self, fsync: bool = True) -> None:
+        """
+        Writes dirty pages back to the file and, if fsync is True, waits until the
+        operating system has them on disk.
+        :param fsync: Also call os.fsync on the file.
+        :return: None
+        """
+        if self._readonly:
+            return
+        self._mm.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """
+        Flushes (without fsync) and unmaps the file.
+        :return: None
+        """
+        if self._mm.closed:
+            return
+        if not self._readonly:
+            self._mm.flush()
+        self._mm.close()
+        self._file.close()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), 'example.hmap')
+
+    print("\nPDF - put example 1 (persisted)")
+    print("-------------------------------")
+    with HashMap(path, 53) as m:
+        for i in range(150):
+            m.put('str' + str(i), i * 100)
+            if i % 25 == 24:
+                print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+        m.flush()
+
+    print("\nReopened read-only")
+    print("------------------")
+    with HashMap(path, readonly=True) as m:
+        print(m.get_size(), m.get_capacity(), m.get('str42'), m.contains_key('str150'))
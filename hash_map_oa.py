@@ -4,28 +4,103 @@
 # Assignment: 6 - Hashmaps
 # Due Date: June 9, 2023
 # Description: Hashmap using open addressing with quadratic probing to solve collisions.
+#              Other probing strategies can be plugged in from probing.py.
 
-from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
-                        hash_function_1, hash_function_2)
+import random
+import time
+from itertools import chain, islice
+
+import hash_map_dump
+from capacity import CapacityPolicy, PrimeCapacity
+from a6_include import (DynamicArray, HashEntry, hash_function_id,
+                        hash_function_1, hash_function_2, key_hash_function,
+                        key_hash_is_stable, seeded_hash_function)
+from map_stats import MapStats
+from map_views import ItemsView, KeysView, ValuesView
+from probing import ProbingStrategy, QuadraticProbing, TriangularProbing
+
+
+# Pairs per put_many() call when from_items() streams an iterable of known size.
+_BUILD_CHUNK = 4096
+
+# Marks an old-table slot whose entry has been moved by an incremental resize.
+_MOVED = HashEntry(None, None)
+_MOVED.is_tombstone = True
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    # Old-table slots migrated by each operation during an incremental resize.
+    _MIGRATE_STEP = 8
+    # With flood_guard on, a probe this long is taken as a hash flooding attack: at the
+    # default probe load of 0.5 under a random hash, probes average under two steps.
+    _FLOOD_PROBE_LENGTH = 64
+
+    def __init__(self, capacity: int, function, incremental: bool = False,
+                 probing: ProbingStrategy = None, policy: CapacityPolicy = None,
+                 flood_guard: bool = False) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        :param capacity: Initial capacity, rounded up to one the policy allows.
+        :param function: Hash function used for keys.
+        :param incremental: If True, growing the table spreads the rehash across later
+                            put/get/remove calls instead of doing it all at once.
+        :param probing: Collision resolution strategy from probing.py; quadratic by default
+                        (triangular on power-of-two capacities).
+        :param policy: Capacity policy from capacity.py. By default capacities are primes,
+                       the table grows at probe load 0.5 and never shrinks.
+        :param flood_guard: If True, a probe of _FLOOD_PROBE_LENGTH steps makes the map
+                            switch to SipHash under a random seed of its own and rehash,
+                            so keys crafted to collide under function stop colliding.
         """
-        self._buckets = DynamicArray()
+        self._policy = policy if policy is not None else PrimeCapacity()
+        if probing is None:
+            power_of_two = self._policy.capacity_kind == 'power_of_two'
+            probing = TriangularProbing() if power_of_two else QuadraticProbing()
+        if probing.capacity_kind not in (None, self._policy.capacity_kind):
+            raise ValueError(f"{probing.name} probing needs {probing.capacity_kind} capacities, "
+                             f"not {self._policy.name}")
+        self._grow_at, self._shrink_at = self._policy.thresholds(0.5)
+        if self._grow_at > probing.max_load:
+            raise ValueError(f"{probing.name} probing needs grow_at <= {probing.max_load}")
+        self._probing = probing
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+        self._buckets = DynamicArray()
+        self._capacity = self._policy.round_up(capacity)
+        # Shrinking never goes below the initial capacity.
+        self._min_capacity = self._capacity
+        self._buckets.fill(None, self._capacity)
 
         self._hash_function = function
+        # What keys are actually hashed with: function for str keys (key_hash_function()
+        # covers the other key types), then the policy's mixer if it has one.
+        self._hash = self._policy.hasher(key_hash_function(function))
         self._size = 0
 
+        # Occupancy counters for the current bucket array, kept up to date by every
+        # operation so table_load()/empty_buckets() never have to scan the table.
+        self._occupied = 0
+        self._tombstones = 0
+        self._longest_probe = 0
+
+        # Old table and migration cursor while an incremental resize is in progress.
+        self._incremental = incremental
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+
+        # Bumped by every insert, remove, resize and clear, so iterators can tell the
+        # map changed underneath them.
+        self._version = 0
+
+        # MapStats while telemetry is enabled (see enable_stats()), otherwise None.
+        self._stats = None
+
+        # _store()/_place() set _flooded when a probe reaches _flood_length; the next
+        # insert then calls _reseed().
+        self._flood_length = self._FLOOD_PROBE_LENGTH if flood_guard else float('inf')
+        self._flooded = False
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -92,31 +167,420 @@ class HashMap:
         :param value: Value of HashEntry object
         :return: None
         """
-        # Check if resize needed.
-        if self.table_load() >= 0.5:
-            self.resize_table(self._capacity*2)
-        initial_index = self._hash_function(key) % self._capacity
-        index = initial_index
-        count = 0
-        # Quadratic Probing Loop
-        while self._buckets[index]:
-            if self._buckets[index].key == key:
-                self._buckets[index].value = value
-                if self._buckets[index].is_tombstone is True:
-                    self._buckets[index].is_tombstone = False
-                    self._size += 1
-                return
-            elif self._buckets[index].is_tombstone is True:
-                self._buckets[index] = HashEntry(key, value)
-                self._size += 1
-                return
-            index = (initial_index + count**2) % self._capacity
-            count += 1
-        # Once empty slot is found, add the HashEntry to it.
-        self._buckets[index] = HashEntry(key, value)
+        hash_value, buckets, index, found, probes = self._upsert_lookup(key, 'put')
+        if found:
+            buckets[index].value = value
+        else:
+            self._insert(index, key, value, hash_value, probes)
+
+    def _upsert_lookup(self, key: str, operation: str) -> (int, DynamicArray, int, bool, int):
+        """
+        First half of every operation that may add key: advances any incremental resize,
+        grows or compacts the table if needed, then probes for key once (plus once in the
+        old table during an incremental resize).
+        :param key: Key to look up.
+        :param operation: Name of the calling method, for telemetry.
+        :return: Tuple: (hash of key, bucket array, index, found, probes). If found, the entry
+                 is at bucket array[index]; otherwise index and probes are where the key
+                 belongs in the current table, for _insert().
+        """
+        if self._old_buckets is not None:
+            self._migrate_step()
+        # Check if resize needed. Tombstones lengthen probes just like live entries, so they
+        # count toward the limit; when they outnumber live entries, rebuilding at the same
+        # capacity clears them without growing the table.
+        if self.probe_load() >= self._grow_at:
+            if self._tombstones > self._size:
+                self._rebuild(self._capacity)
+            else:
+                self._rebuild(self._policy.grow(self._capacity))
+        hash_value = self._hash(key)
+        index, found, probes = self._probing.probe(self._buckets, self._capacity, key, hash_value)
+        # During an incremental resize the key may still live in the old table.
+        if not found and self._old_buckets is not None:
+            old_index, old_found, old_probes = self._probing.probe(self._old_buckets, self._old_capacity,
+                                                                   key, hash_value)
+            if self._stats is not None:
+                self._stats.lookup(operation, probes + old_probes)
+            if old_found:
+                return hash_value, self._old_buckets, old_index, True, 0
+        elif self._stats is not None:
+            self._stats.lookup(operation, probes)
+        return hash_value, self._buckets, index, found, probes
+
+    def _insert(self, index: int, key: str, value: object, hash_value: int, probes: int) -> None:
+        """
+        Adds a key that _upsert_lookup() found absent, reusing the first tombstone seen on
+        the probe path or the empty slot that ended it.
+        :return: None
+        """
+        self._store(index, HashEntry(key, value, hash_value), probes)
         self._size += 1
+        if self._flooded:
+            self._reseed()
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Returns the value of key, first adding key with the default value if it is absent.
+        :param key: Key to look up.
+        :param default: Value stored when key is absent.
+        :return: Value now associated with key.
+        """
+        hash_value, buckets, index, found, probes = self._upsert_lookup(key, 'setdefault')
+        if found:
+            return buckets[index].value
+        self._insert(index, key, default, hash_value, probes)
+        return default
+
+    def get_or_insert(self, key: str, factory: callable) -> object:
+        """
+        Returns the value of key, first adding key with factory() if it is absent.
+        factory is only called when the key is absent.
+        :param key: Key to look up.
+        :param factory: Zero-argument callable that makes the value for a new key.
+        :return: Value now associated with key.
+        """
+        hash_value, buckets, index, found, probes = self._upsert_lookup(key, 'get_or_insert')
+        if found:
+            return buckets[index].value
+        value = factory()
+        self._insert(index, key, value, hash_value, probes)
+        return value
+
+    def compute(self, key: str, fn: callable) -> object:
+        """
+        Replaces the value of key with fn(current value), passing None when key is absent.
+        If fn returns None the key is removed (or stays absent).
+        :param key: Key to update.
+        :param fn: One-argument callable computing the new value.
+        :return: The new value, or None if the key was removed.
+        """
+        hash_value, buckets, index, found, probes = self._upsert_lookup(key, 'compute')
+        value = fn(buckets[index].value if found else None)
+        if not found:
+            if value is not None:
+                self._insert(index, key, value, hash_value, probes)
+        elif value is None:
+            self._delete(buckets, index)
+        else:
+            buckets[index].value = value
+        return value
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Adds delta to the number stored under key, starting from 0 if key is absent.
+        :param key: Key to count.
+        :param delta: Amount to add.
+        :return: The new count.
+        """
+        hash_value, buckets, index, found, probes = self._upsert_lookup(key, 'increment')
+        if not found:
+            self._insert(index, key, delta, hash_value, probes)
+            return delta
+        entry = buckets[index]
+        entry.value += delta
+        return entry.value
+
+    def pop(self, key: str, default: object = None) -> object:
+        """
+        Removes key and returns its value, or returns default if key is absent.
+        :param key: Key to remove.
+        :param default: Value returned when key is absent.
+        :return: Removed value or default.
+        """
+        if self._old_buckets is not None:
+            self._migrate_step()
+        buckets, index = self._find(key, 'pop')
+        if buckets is None:
+            return default
+        value = buckets[index].value
+        self._delete(buckets, index)
+        return value
+
+    def _store(self, index: int, entry: HashEntry, probes: int) -> None:
+        """
+        Writes a new entry into the slot probe() returned for its key and updates the
+        occupancy counters.
+        :param index: Slot returned by probe().
+        :param entry: HashEntry to store.
+        :param probes: Probe count returned by probe().
+        :return: None
+        """
+        self._version += 1
+        reused, longest = self._probing.insert(self._buckets, self._capacity, index, entry, probes)
+        if reused:
+            self._tombstones -= 1
+        else:
+            self._occupied += 1
+        if longest > self._longest_probe:
+            self._longest_probe = longest
+            if longest >= self._flood_length:
+                self._flooded = True
+
+    def _find(self, key: str, operation: str) -> (DynamicArray, int):
+        """
+        Searches the live table and, during an incremental resize, the old table.
+        :param key: Key to search for.
+        :param operation: Name of the calling method, for telemetry.
+        :return: Tuple: (bucket array, index) of the live entry, or (None, -1) if absent.
+        """
+        hash_value = self._hash(key)
+        buckets = self._buckets
+        index, found, probes = self._probing.probe(buckets, self._capacity, key, hash_value)
+        if not found and self._old_buckets is not None:
+            buckets = self._old_buckets
+            index, found, old_probes = self._probing.probe(buckets, self._old_capacity, key, hash_value)
+            probes += old_probes
+        if self._stats is not None:
+            self._stats.lookup(operation, probes)
+        if found:
+            return buckets, index
+        return None, -1
+
+    def _rebuild(self, new_capacity: int) -> None:
+        """
+        Rehashes into a fresh table of new_capacity, dropping all tombstones. In incremental
+        mode this only allocates the new table; later operations move the old entries
+        across a few slots at a time.
+        :param new_capacity: Capacity of the new table (the current one to compact in place).
+        :return: None
+        """
+        if not self._incremental:
+            self.resize_table(new_capacity)
+            return
+
+        # A migration still in flight has to land before a new one can start. With a step
+        # per operation the old table empties long before the new one fills, so this only
+        # has work to do when one bulk call outgrows the table mid-migration.
+        self._finish_migration()
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._migrate_index = 0
+        self._capacity = self._policy.round_up(new_capacity)
+        self._buckets = DynamicArray()
+        self._buckets.fill(None, self._capacity)
+        self._reset_counters()
+        if self._stats is not None:
+            # Only the allocation; the entries move during later operations.
+            self._stats.resize(self._old_capacity, self._capacity, 0, 0.0)
+
+    def _reset_counters(self) -> None:
+        """
+        Resets the occupancy counters for a freshly allocated or cleared bucket array.
+        :return: None
+        """
+        self._occupied = 0
+        self._tombstones = 0
+        self._longest_probe = 0
+        self._version += 1
+
+    def _migrate_step(self) -> None:
+        """
+        Moves the next _MIGRATE_STEP slots of the old table into the live table.
+        Moved slots become tombstones so probe paths through the old table stay intact.
+        :return: None
+        """
+        old_da = self._old_buckets
+        index = self._migrate_index
+        end = min(index + self._MIGRATE_STEP, self._old_capacity)
+        while index < end:
+            entry = old_da.get_at_index(index)
+            if entry and not entry.is_tombstone:
+                self._place(entry)
+                old_da.set_at_index(index, _MOVED)
+            index += 1
+        self._migrate_index = index
+        if index == self._old_capacity:
+            self._old_buckets = None
+            self._old_capacity = 0
+
+    def _finish_migration(self) -> None:
+        """
+        Completes any incremental resize that is still in progress.
+        :return: None
+        """
+        while self._old_buckets is not None:
+            self._migrate_step()
 
+    def put_many(self, pairs) -> None:
+        """
+        Adds or updates every key/value pair in one pass. Capacity is checked once up front,
+        so at most one resize happens no matter how many pairs are given.
+        :param pairs: Iterable (or DynamicArray) of (key, value) tuples.
+        :return: None
+        """
+        pairs = _as_list(pairs)
+        # Like put(), one step of any incremental resize per call, never the whole of it.
+        if self._old_buckets is not None:
+            self._migrate_step()
+        # Rebuild once, to a capacity that keeps the load below the limit after every pair is placed.
+        self.reserve(self._size + len(pairs))
+
+        if self._stats is not None:
+            # Telemetry records every probe sequence, so take the single-key path; the loop
+            # below stays free of it.
+            for key, value in pairs:
+                hash_value, buckets, index, found, probes = self._upsert_lookup(key, 'put_many')
+                if found:
+                    buckets[index].value = value
+                else:
+                    self._insert(index, key, value, hash_value, probes)
+            return
+
+        probe = self._probing.probe
+        insert = self._probing.insert
+        hash_function = self._hash
+        buckets = self._buckets
+        capacity = self._capacity
+        slot = buckets.getter()
+        # Keys not moved yet by an incremental resize are updated where they are.
+        old_buckets = self._old_buckets
+        old_capacity = self._old_capacity
+        longest = self._longest_probe
+        added = reused = 0
+        for key, value in pairs:
+            hash_value = hash_function(key)
+            # Most keys land on an empty home slot or find themselves there; probe() is
+            # only called past it.
+            index = hash_value % capacity
+            entry = slot(index)
+            probes = 0
+            if entry is not None:
+                if entry.hash_value == hash_value and entry.key == key and not entry.is_tombstone:
+                    entry.value = value
+                    continue
+                index, found, probes = probe(buckets, capacity, key, hash_value)
+                if found:
+                    slot(index).value = value
+                    continue
+            if old_buckets is not None:
+                old_index, found, _ = probe(old_buckets, old_capacity, key, hash_value)
+                if found:
+                    old_buckets.get_at_index(old_index).value = value
+                    continue
+            # _store() inlined, with the size, counters and version updated once after the loop.
+            tombstone_reused, length = insert(buckets, capacity, index, HashEntry(key, value, hash_value),
+                                              probes)
+            added += 1
+            reused += tombstone_reused
+            if length > longest:
+                longest = length
+        if added:
+            self._size += added
+            self._occupied += added - reused
+            self._tombstones -= reused
+            self._version += 1
+        if longest > self._longest_probe:
+            self._longest_probe = longest
+            if longest >= self._flood_length:
+                self._flooded = True
+        if self._flooded:
+            self._reseed()
+
+    def reserve(self, n: int) -> None:
+        """
+        Rebuilds the table once, if needed, so that it holds n entries in total without
+        another resize. Tombstones count toward the limit, and the rebuild drops them.
+        Never shrinks the table; with a shrinking policy, removals still can.
+        In incremental mode the rebuild is incremental too; see _rebuild().
+        :param n: Number of entries to make room for.
+        :return: None
+        """
+        n = max(n, self._size)
+        if (n + self._tombstones) / self._capacity >= self._grow_at:
+            new_capacity = self._capacity
+            while n / new_capacity >= self._grow_at:
+                new_capacity = self._policy.grow(new_capacity)
+            self._rebuild(new_capacity)
+
+    @classmethod
+    def from_items(cls, items, function, expected_size: int = None, probing: ProbingStrategy = None,
+                   policy: CapacityPolicy = None, flood_guard: bool = False) -> "HashMap":
+        """
+        Builds a map from (key, value) pairs, sizing the table once for all of them and
+        then adding them through put_many(), so the table is not rehashed along the way.
+        Later pairs win over earlier ones with the same key.
+        :param items: Iterable (or DynamicArray) of (key, value) tuples.
+        :param function: Hash function used for keys.
+        :param expected_size: Number of pairs, if known. The pairs are then streamed in
+                              chunks rather than counted first, which would read a generator
+                              into a list. An estimate that is too low costs the usual resizes.
+        :param probing: Collision resolution strategy from probing.py.
+        :param policy: Capacity policy from capacity.py.
+        :param flood_guard: See __init__().
+        :return: New HashMap
+        """
+        new_map = cls(11, function, probing=probing, policy=policy, flood_guard=flood_guard)
+        if expected_size is None:
+            new_map.put_many(items)
+        else:
+            new_map.reserve(expected_size)
+            iterator = iter(items)
+            chunk = list(islice(iterator, _BUILD_CHUNK))
+            while chunk:
+                new_map.put_many(chunk)
+                chunk = list(islice(iterator, _BUILD_CHUNK))
+        return new_map
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Looks up every key in one pass.
+        :param keys: Iterable (or DynamicArray) of keys.
+        :return: DynamicArray of values, with None for keys that are not in the map.
+        """
+        return DynamicArray([None if entry is None else entry.value
+                             for entry in self._find_many(keys, 'get_many')])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Checks every key for membership in one pass.
+        :param keys: Iterable (or DynamicArray) of keys.
+        :return: DynamicArray of booleans, in the same order as keys.
+        """
+        return DynamicArray([entry is not None for entry in self._find_many(keys, 'contains_many')])
 
+    def _find_many(self, keys, operation: str) -> list:
+        """
+        Looks up every key, for get_many() and contains_many(). Like get(), it advances any
+        incremental resize by one step per call; keys not moved yet are read from the old table.
+        :param keys: Iterable (or DynamicArray) of keys.
+        :param operation: Name of the calling method, for telemetry.
+        :return: List of the live HashEntry of each key, None for keys that are not in the map.
+        """
+        if self._old_buckets is not None:
+            self._migrate_step()
+        keys = _as_list(keys)
+        if self._stats is not None:
+            # Telemetry records every probe sequence, so take the single-key path; the loop
+            # below stays free of it.
+            entries = []
+            for key in keys:
+                buckets, index = self._find(key, operation)
+                entries.append(None if buckets is None else buckets[index])
+            return entries
+
+        probe = self._probing.probe
+        hash_function = self._hash
+        buckets = self._buckets
+        capacity = self._capacity
+        slot = buckets.getter()
+        old_buckets = self._old_buckets
+        old_capacity = self._old_capacity
+        entries = []
+        append = entries.append
+        for key, hash_value in zip(keys, map(hash_function, keys)):
+            # Most keys are in their home slot or miss on an empty one; probe() is only
+            # called past it.
+            entry = slot(hash_value % capacity)
+            if entry is not None and not (entry.hash_value == hash_value and entry.key == key
+                                          and not entry.is_tombstone):
+                index, found, _ = probe(buckets, capacity, key, hash_value)
+                entry = slot(index) if found else None
+            if entry is None and old_buckets is not None:
+                index, found, _ = probe(old_buckets, old_capacity, key, hash_value)
+                entry = old_buckets[index] if found else None
+            append(entry)
+        return entries
 
     def table_load(self) -> float:
         """
@@ -125,47 +589,244 @@ class HashMap:
         """
         return float(self._size/self._capacity)
 
+    def probe_load(self) -> float:
+        """
+        Returns the fraction of slots that probes have to pass over: live entries plus tombstones.
+        :return: Float of probe load.
+        """
+        return float((self._size + self._tombstones)/self._capacity)
+
     def empty_buckets(self) -> int:
         """
-        Clears the contents of the hashmap, keeping the underlying capacity.
-        :return: N/A
+        Returns the number of empty buckets in the hash table.
+        Tombstones are not empty, since probes have to pass over them.
+        :return: Number of empty buckets
         """
-        count = 0
-        for i in range(self._capacity):
-            if not self._buckets[i]:
-                count += 1
-        return count
+        return self._capacity - self._occupied
 
+    def tombstones(self) -> int:
+        """
+        Returns the number of tombstones in the hash table.
+        :return: Number of tombstones
+        """
+        return self._tombstones
+
+    def longest_probe(self) -> int:
+        """
+        Returns the longest probe sequence any entry needed when it was placed,
+        since the table was last rebuilt or cleared.
+        :return: Longest probe length
+        """
+        return self._longest_probe
 
     def resize_table(self, new_capacity: int) -> None:
         """
-        Changes the capacity of the hash table. Rehashes all previous entries.
+        Changes the capacity of the hash table. Rehashes all previous entries, including
+        those an incremental resize in progress has not moved yet.
         :param new_capacity: New capacity to be used
         :return: None
         """
         # Make sure new capacity is a valid size.
         if new_capacity < self._size:
             return
+        start = time.perf_counter() if self._stats is not None else 0.0
+        old_capacity = self._capacity
+
+        # Make sure the new capacity is one the policy allows (a prime by default).
+        new_capacity = self._policy.round_up(new_capacity)
 
-        # Make sure the new capacity is a valid prime number.
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        # Keep growing until the last entry would be placed below the load limit,
+        # the same capacity re-inserting everything through put() would settle on.
+        while (self._size - 1) / new_capacity >= self._grow_at:
+            new_capacity = self._policy.grow(new_capacity)
 
-        # Save old Dynamic Array.
+        # Save old Dynamic Array, and the table an incremental resize is emptying, if any.
         old_da = self._buckets
+        unmoved_da = self._old_buckets
+        self._old_buckets = None
+        self._old_capacity = 0
 
-        # Update capacity.
+        # Update capacity and create new empty DA at correct capacity.
         self._capacity = new_capacity
+        self._buckets = DynamicArray()
+        self._buckets.fill(None, new_capacity)
+        self._reset_counters()
+        self._rehash(old_da)
+        if unmoved_da is not None:
+            self._rehash(unmoved_da)
+        if self._stats is not None:
+            self._stats.resize(old_capacity, new_capacity, self._size, time.perf_counter() - start)
+
+    def _rehash(self, old_da: DynamicArray) -> None:
+        """
+        Moves every live HashEntry from old_da into the (empty) current bucket array.
+        Keys are already unique and the capacity is already large enough, so entries
+        are placed directly and reused rather than going back through put(), and their
+        cached hashes mean the hash function is not called again.
+        :param old_da: Bucket array being replaced.
+        :return: None
+        """
+        place = self._place
+        for entry in old_da:
+            if entry and not entry.is_tombstone:
+                place(entry)
+
+    def _place(self, entry: HashEntry) -> None:
+        """
+        Stores an entry whose key is known to be absent in the current bucket array,
+        without any key comparisons.
+        :param entry: HashEntry to store.
+        :return: None
+        """
+        longest = self._probing.place(self._buckets, self._capacity, entry)
+        self._occupied += 1
+        if longest > self._longest_probe:
+            self._longest_probe = longest
+            if longest >= self._flood_length:
+                self._flooded = True
+
+    def _reseed(self) -> None:
+        """
+        Switches to SipHash under a fresh random seed and rebuilds the table with the new
+        hashes, dropping tombstones. Entries are copied rather than moved, so a
+        copy_on_write() copy sharing them is left as it was. Entries an incremental resize
+        has not moved yet are rehashed straight from the old table.
+        :return: None
+        """
+        self._flooded = False
+        self._hash_function = seeded_hash_function(random.getrandbits(128))
+        self._update_hash()
+        start = time.perf_counter() if self._stats is not None else 0.0
 
-        # Create new empty DA at correct capacity.
+        old_da = self._buckets
+        unmoved_da = self._old_buckets
+        self._old_buckets = None
+        self._old_capacity = 0
         self._buckets = DynamicArray()
-        for i in range(new_capacity):
-            self._buckets.append(None)
-        self._size = 0
-        # Rehash all HashEntry objects from old_da
-        for i in range(old_da.length()):
-            if old_da[i] and old_da[i].is_tombstone is False:
-                self.put(old_da[i].key, old_da[i].value)
+        self._buckets.fill(None, self._capacity)
+        self._reset_counters()
+        hash_function = self._hash
+        place = self._place
+        for table in (old_da, unmoved_da or ()):
+            for entry in table:
+                if entry and not entry.is_tombstone:
+                    place(HashEntry(entry.key, entry.value, hash_function(entry.key)))
+        if self._stats is not None:
+            self._stats.reseed(self._size, time.perf_counter() - start)
+
+    def copy_on_write(self, keys, growth: int = 0) -> "HashMap":
+        """
+        Returns a copy of the map that shares every HashEntry with this one except the
+        entries of the given keys, which are copied. put()/remove() of those keys on the
+        copy then leave this map untouched, so it stays safe to read from other threads.
+        A resize of the copy only moves entries, so growth needs no special handling.
+        Any incremental resize in progress is completed first; copying the slot array
+        costs as much anyway. With stats enabled, the copy records its own from scratch.
+        :param keys: Keys the caller is about to put or remove on the copy.
+        :param growth: Most keys the caller may add (unused; kept for parity with hash_map_sc).
+        :return: New HashMap
+        """
+        self._finish_migration()
+        new_map = HashMap.__new__(HashMap)
+        new_map.__dict__.update(self.__dict__)
+        if self._stats is not None:
+            new_map._stats = MapStats('probes', self._stats.callback)
+            new_map._update_hash()
+        new_map._buckets = self._buckets.slice(0, self._capacity)
+        for key in _as_list(keys):
+            buckets, index = new_map._find(key, 'copy_on_write')
+            if buckets is not None:
+                entry = buckets.get_at_index(index)
+                buckets.set_at_index(index, HashEntry(entry.key, entry.value, entry.hash_value))
+        return new_map
+
+    def dump(self, file) -> None:
+        """
+        Writes the map to a binary file in the hash_map_dump format: capacity, hash function
+        id, probing strategy and capacity policy, and every occupied slot (tombstones included, so probe paths
+        survive) with its index and cached hash. Entries an incremental resize has not moved
+        yet follow with index None; load() places them once the rest are in.
+        Keys and values must be built-in data types (see hash_map_dump); anything else raises
+        DumpFormatException.
+        :param file: Binary file open for writing.
+        :return: None
+        """
+        unmoved = self._old_buckets or ()
+        stable = all(key_hash_is_stable(entry.key) for table in (self._buckets, unmoved)
+                     for entry in table if entry and not entry.is_tombstone)
+        hash_map_dump.write_header(file, b'O', self._capacity, self._size, self._longest_probe,
+                                   hash_function_id(self._hash_function), self._layout(),
+                                   0 if stable else hash_map_dump.UNSTABLE_HASHES)
+        writer = hash_map_dump.ChunkWriter(file)
+        for index, entry in enumerate(self._buckets):
+            if entry is None:
+                continue
+            if entry.is_tombstone:
+                writer.write(index, None, None, None)
+            else:
+                writer.write(index, entry.hash_value, entry.key, entry.value)
+        for entry in unmoved:
+            if entry and not entry.is_tombstone:
+                writer.write(None, entry.hash_value, entry.key, entry.value)
+        writer.close()
+
+    def load(self, file) -> None:
+        """
+        Replaces the contents of the map with a dump written by dump(). When the dump was
+        made with the same hash function, probing strategy and capacity policy, every entry goes straight
+        back into its recorded slot without probing, after re-hashing a sample of keys to
+        check them; otherwise (and for hash functions without an id, see hash_function_id(),
+        or keys whose hash differs between processes) every entry is put() again. Entries are read one chunk at a time. Only built-in data types are
+        decoded, so a dump from an untrusted source cannot run code; it can still hold
+        wrong slot indexes or hashes, which a map loaded from it would trust.
+        :param file: Binary file open for reading.
+        :return: None
+        """
+        capacity, size, longest, function_id, layout, flags = hash_map_dump.read_header(file, b'O')
+        chunks = hash_map_dump.read_chunks(file)
+        first = next(chunks, [])
+        chunks = chain((first,), chunks)
+        if (not function_id or function_id != hash_function_id(self._hash_function)
+                or layout != self._layout() or flags & hash_map_dump.UNSTABLE_HASHES
+                or not hash_map_dump.hashes_match(first, self._hash)):
+            self.clear()
+            for chunk in chunks:
+                self.put_many([(key, value) for _, hash_value, key, value in chunk
+                               if hash_value is not None])
+            return
+
+        self._capacity = capacity
+        self._buckets = DynamicArray()
+        self._buckets.fill(None, capacity)
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._reset_counters()
+        self._size = size
+        self._longest_probe = longest
+        set_at_index = self._buckets.set_at_index
+        # Entries dumped mid-migration have no slot yet; they can only be placed once
+        # every recorded slot is filled.
+        unplaced = []
+        for chunk in chunks:
+            for index, hash_value, key, value in chunk:
+                entry = HashEntry(key, value, hash_value)
+                if index is None:
+                    unplaced.append(entry)
+                    continue
+                if hash_value is None:
+                    entry.is_tombstone = True
+                    self._tombstones += 1
+                set_at_index(index, entry)
+                self._occupied += 1
+        for entry in unplaced:
+            self._place(entry)
+
+    def _layout(self) -> str:
+        """
+        Names what decides where entries sit besides the hash function, for dump().
+        :return: Probing strategy and capacity policy names.
+        """
+        return f"{self._probing.name} {self._policy.name}"
 
     def get(self, key: str) -> object:
         """
@@ -173,16 +834,11 @@ class HashMap:
         :param key: Key to search for.
         :return: Value or None.
         """
-        initial_index = self._hash_function(key) % self._capacity
-        index = initial_index
-        count = 0
-        # Quadratic Probing Loop
-        while self._buckets[index]:
-            # If key is found, and it is not a tombstone, return value.
-            if self._buckets[index].key == key and not self._buckets[index].is_tombstone:
-                return self._buckets[index].value
-            index = (initial_index + count**2) % self._capacity
-            count += 1
+        if self._old_buckets is not None:
+            self._migrate_step()
+        buckets, index = self._find(key, 'get')
+        if buckets is not None:
+            return buckets[index].value
 
     def contains_key(self, key: str) -> bool:
         """
@@ -190,39 +846,43 @@ class HashMap:
         :param key: Key to be searched for.
         :return: Boolean
         """
-        initial_index = self._hash_function(key) % self._capacity
-        index = initial_index
-        count = 0
-        # Quadratic Probing Loop
-        while self._buckets[index]:
-            if self._buckets[index].key == key and not self._buckets[index].is_tombstone:
-                return True
-            index = (initial_index + count**2) % self._capacity
-            count += 1
-        return False
+        if self._old_buckets is not None:
+            self._migrate_step()
+        return self._find(key, 'contains_key')[0] is not None
 
     def remove(self, key: str) -> None:
         """
-        Removes the key and its associated value from the hash map, leaving behind a tombstone.
+        Removes the key and its associated value from the hash map, leaving behind a tombstone
+        (or, with Robin Hood probing, shifting the rest of the run back).
         :param key: Key to be removed.
         :return: None
         """
-        if not self.contains_key(key):
-            return
-
-        # Quadratic Probing
-        initial_index = self._hash_function(key) % self._capacity
-        index = initial_index
-        count = 0
-        # Don't delete HashEntry, just turn it into a tombstone.
-        while self._buckets[index]:
-            if self._buckets[index].key == key:
-                self._buckets[index].is_tombstone = True
-                self._size -= 1
-                return
-            index = (initial_index + count**2) % self._capacity
-            count += 1
+        if self._old_buckets is not None:
+            self._migrate_step()
+        buckets, index = self._find(key, 'remove')
+        if buckets is not None:
+            self._delete(buckets, index)
 
+    def _delete(self, buckets: DynamicArray, index: int) -> None:
+        """
+        Deletes the live entry at buckets[index], found by _find() or _upsert_lookup().
+        :param buckets: The current table or, during an incremental resize, the old one.
+        :param index: Slot of the entry.
+        :return: None
+        """
+        self._size -= 1
+        self._version += 1
+        if buckets is not self._buckets:
+            # The old table of an incremental resize is being discarded; a tombstone is enough.
+            buckets[index].is_tombstone = True
+        elif self._probing.remove(buckets, self._capacity, index):
+            self._tombstones += 1
+        else:
+            self._occupied -= 1
+        if (self._shrink_at is not None and self._capacity > self._min_capacity
+                and self._size / self._capacity < self._shrink_at):
+            # Halve the table, down to the initial capacity at most.
+            self._rebuild(max(self._policy.shrink(self._capacity), self._min_capacity))
 
     def clear(self) -> None:
         """
@@ -230,8 +890,55 @@ class HashMap:
         :return: None
         """
         self._size = 0
-        for i in range(self._buckets.length()):
-            self._buckets[i] = None
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._reset_counters()
+        self._buckets = DynamicArray()
+        self._buckets.fill(None, self._capacity)
+
+    def enable_stats(self, callback: callable = None) -> None:
+        """
+        Starts recording telemetry from scratch: probe steps of every lookup, resizes,
+        and hash function time. Until then (and after disable_stats()) none of it costs
+        more than a None check per operation.
+        :param callback: Optional callback(event, data) for every recorded event; see MapStats.
+        :return: None
+        """
+        self._stats = MapStats('probes', callback)
+        self._update_hash()
+
+    def disable_stats(self) -> None:
+        """
+        Stops recording telemetry and drops what was recorded.
+        :return: None
+        """
+        self._stats = None
+        self._update_hash()
+
+    def _update_hash(self) -> None:
+        """
+        Rebuilds _hash from the hash function, the policy's mixer and, with stats
+        enabled, the timing wrapper.
+        :return: None
+        """
+        self._hash = self._policy.hasher(key_hash_function(self._hash_function))
+        if self._stats is not None:
+            self._hash = self._stats.timed(self._hash)
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the recorded telemetry (see MapStats.snapshot()) plus the
+        current size, capacity, loads, tombstones and longest probe, or an empty dict
+        while disabled.
+        :return: Dict of statistics.
+        """
+        if self._stats is None:
+            return {}
+        snapshot = self._stats.snapshot()
+        snapshot.update(size=self._size, capacity=self._capacity, table_load=self.table_load(),
+                        probe_load=self.probe_load(), tombstones=self._tombstones,
+                        longest_probe=self._longest_probe)
+        return snapshot
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -240,34 +947,87 @@ class HashMap:
         """
         kv_da = DynamicArray()
         # Loop through buckets, only appending the non-tombstone slots.
-        for i in range(self._capacity):
-            if self._buckets[i]:
-                if not self._buckets[i].is_tombstone:
-                    kv_da.append((self._buckets[i].key, self._buckets[i].value))
+        for entry in self._buckets:
+            if entry and not entry.is_tombstone:
+                kv_da.append((entry.key, entry.value))
+        # Entries not yet migrated by an incremental resize.
+        if self._old_buckets is not None:
+            for i in range(self._migrate_index, self._old_capacity):
+                if self._old_buckets[i] and not self._old_buckets[i].is_tombstone:
+                    kv_da.append((self._old_buckets[i].key, self._old_buckets[i].value))
         return kv_da
 
 
+    def keys(self) -> KeysView:
+        """
+        Returns a live view of the keys; iterating it copies nothing.
+        :return: KeysView
+        """
+        return KeysView(self, self._entries)
+
+    def values(self) -> ValuesView:
+        """
+        Returns a live view of the values; iterating it copies nothing.
+        :return: ValuesView
+        """
+        return ValuesView(self, self._entries)
+
+    def items(self) -> ItemsView:
+        """
+        Returns a live view of the (key, value) pairs; iterating it copies nothing.
+        :return: ItemsView
+        """
+        return ItemsView(self, self._entries)
+
     def __iter__(self):
         """
-        Iterator dunder.
-        :return:
+        Iterator dunder. Each call returns its own generator, so iterations can be nested.
+        :return: Generator of the live HashEntry objects.
         """
-        self._index = 0
-        return self
+        return self._entries()
 
-    def __next__(self):
+    def _entries(self):
         """
-        Advance iterator dunder.
-        :return:
+        Yields every live HashEntry, slot by slot, without building an array. During an
+        incremental resize the old table is walked one migration step at a time, so
+        iterating moves it along instead of stalling on it. Raises RuntimeError if the map
+        gains or loses keys or is resized meanwhile.
+        :return: Generator of HashEntry objects.
         """
-        self._index += 1
-        try:
-            while not self._buckets[self._index] or self._buckets[self._index].is_tombstone:
-                self._index += 1
-        except DynamicArrayException:
-            raise StopIteration
+        version = self._version
+        # Entries yielded from the old table, already moved into the live one by the time
+        # it is walked.
+        seen = set()
+        while self._old_buckets is not None:
+            old_da = self._old_buckets
+            start = self._migrate_index
+            batch = [old_da.get_at_index(index)
+                     for index in range(start, min(start + self._MIGRATE_STEP, self._old_capacity))]
+            self._migrate_step()
+            for entry in batch:
+                if entry and not entry.is_tombstone:
+                    seen.add(id(entry))
+                    yield entry
+                    if self._version != version:
+                        raise RuntimeError("HashMap changed size during iteration")
+        for entry in self._buckets:
+            if entry and not entry.is_tombstone and id(entry) not in seen:
+                yield entry
+                if self._version != version:
+                    raise RuntimeError("HashMap changed size during iteration")
+        # Catches a change (from another thread) made while walking slots with nothing
+        # left to yield, which the checks after each yield cannot see.
+        if self._version != version:
+            raise RuntimeError("HashMap changed size during iteration")
+
+
+def _as_list(items) -> list:
+    """
+    Converts a DynamicArray or any other iterable into a list so bulk operations
+    know their size up front.
+    """
+    return list(items)
 
-        return self._buckets[self._index]
 
 # ------------------- BASIC TESTING ---------------------------------------- #
 
@@ -0,0 +1,133 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Opt-in telemetry for the HashMaps (hash_map_sc.HashMap.enable_stats() and
+#              hash_map_oa.HashMap.enable_stats()). A map with stats disabled holds None
+#              instead of a MapStats and only pays for an `is not None` check per operation.
+
+import time
+
+from a6_include import SortedBucket
+
+
+class MapStats:
+    """
+    Telemetry recorded by one HashMap: per-operation lookup lengths (probe steps for open
+    addressing, nodes walked for separate chaining) with a histogram of them, resize events,
+    flood guard reseeds, and the time spent in the hash function.
+    An optional callback(event, data) is called for every recorded event, with event
+    'lookup' (data: operation, length), 'resize' (data: see resize()) or 'reseed'
+    (data: size, seconds).
+    """
+
+    def __init__(self, unit: str, callback: callable = None) -> None:
+        """
+        Initialize empty stats.
+        :param unit: What a lookup length counts: 'probes' or 'chain_walk'.
+        :param callback: Optional callback(event, data) for every recorded event.
+        """
+        self.unit = unit
+        self.callback = callback
+        self.operations = {}
+        self.lengths = {}
+        # histogram[n] is the number of lookups of length n.
+        self.histogram = [0]
+        self.resizes = []
+        self.reseeds = 0
+        self.hash_calls = 0
+        self.hash_seconds = 0.0
+
+    def lookup(self, operation: str, length: int) -> None:
+        """
+        Records one lookup.
+        :param operation: Name of the map method that did it.
+        :param length: Probe steps or chain nodes walked.
+        :return: None
+        """
+        self.operations[operation] = self.operations.get(operation, 0) + 1
+        self.lengths[operation] = self.lengths.get(operation, 0) + length
+        histogram = self.histogram
+        while len(histogram) <= length:
+            histogram.append(0)
+        histogram[length] += 1
+        if self.callback is not None:
+            self.callback('lookup', {'operation': operation, 'length': length})
+
+    def chain_walk(self, operation: str, bucket, node) -> None:
+        """
+        Records one separate chaining lookup that ended at node (None for a miss).
+        A SortedBucket counts the comparisons of its binary search.
+        :param operation: Name of the map method that did it.
+        :param bucket: LinkedList or SortedBucket that was searched.
+        :param node: SLNode found, or None.
+        :return: None
+        """
+        if type(bucket) is SortedBucket:
+            length = bucket.length().bit_length()
+        else:
+            length = 0
+            for candidate in bucket:
+                length += 1
+                if candidate is node:
+                    break
+        self.lookup(operation, length)
+
+    def resize(self, old_capacity: int, new_capacity: int, size: int, seconds: float) -> None:
+        """
+        Records one resize (or rebuild at the same capacity).
+        :param old_capacity: Capacity before.
+        :param new_capacity: Capacity after.
+        :param size: Number of entries moved.
+        :param seconds: Time the resize took.
+        :return: None
+        """
+        event = {'old_capacity': old_capacity, 'new_capacity': new_capacity,
+                 'size': size, 'seconds': seconds}
+        self.resizes.append(event)
+        if self.callback is not None:
+            self.callback('resize', dict(event))
+
+    def reseed(self, size: int, seconds: float) -> None:
+        """
+        Records one flood guard rehash under a fresh seed.
+        :param size: Number of entries rehashed.
+        :param seconds: Time the rehash took.
+        :return: None
+        """
+        self.reseeds += 1
+        if self.callback is not None:
+            self.callback('reseed', {'size': size, 'seconds': seconds})
+
+    def timed(self, function: callable) -> callable:
+        """
+        Wraps a hash function so every call adds to hash_calls and hash_seconds.
+        :param function: Hash function to wrap.
+        :return: Wrapped function.
+        """
+        perf_counter = time.perf_counter
+
+        def timed_hash(key):
+            start = perf_counter()
+            hash_value = function(key)
+            self.hash_seconds += perf_counter() - start
+            self.hash_calls += 1
+            return hash_value
+
+        return timed_hash
+
+    def snapshot(self) -> dict:
+        """
+        Returns a copy of everything recorded so far.
+        :return: Dict with keys unit, operations (count per operation), mean_length (per
+                 operation), histogram, resizes, reseeds, hash_calls and hash_seconds.
+        """
+        return {
+            'unit': self.unit,
+            'operations': dict(self.operations),
+            'mean_length': {operation: self.lengths[operation] / count
+                            for operation, count in self.operations.items()},
+            'histogram': list(self.histogram),
+            'resizes': [dict(event) for event in self.resizes],
+            'reseeds': self.reseeds,
+            'hash_calls': self.hash_calls,
+            'hash_seconds': self.hash_seconds,
+        }
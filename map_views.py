@@ -0,0 +1,64 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: keys()/values()/items() views for the HashMaps. A view holds no data of its
+#              own: each iter() call starts a fresh generator over the map's buckets, so views
+#              can be iterated nested or several at once, and iteration needs O(1) extra memory.
+
+
+class MapView:
+    """
+    Live, read-only view over a HashMap. Subclasses pick what each entry yields.
+    Changing the map's size or layout while an iterator is active makes that
+    iterator raise RuntimeError.
+    """
+
+    def __init__(self, hash_map, entries) -> None:
+        """
+        Initialize the view.
+        :param hash_map: Map being viewed.
+        :param entries: Generator function of the map that yields its live entries
+                        (objects with key and value attributes).
+        """
+        self._map = hash_map
+        self._entries = entries
+
+    def __len__(self) -> int:
+        """Return the number of entries in the map."""
+        return self._map.get_size()
+
+    def __repr__(self) -> str:
+        """Show the viewed contents, like the built-in dict views."""
+        return f"{type(self).__name__}({list(self)})"
+
+
+class KeysView(MapView):
+    """View of the keys of a HashMap."""
+
+    def __iter__(self):
+        """Return a new iterator over the keys."""
+        return (entry.key for entry in self._entries())
+
+    def __contains__(self, key: str) -> bool:
+        """Membership is a single lookup, not a scan."""
+        return self._map.contains_key(key)
+
+
+class ValuesView(MapView):
+    """View of the values of a HashMap."""
+
+    def __iter__(self):
+        """Return a new iterator over the values."""
+        return (entry.value for entry in self._entries())
+
+
+class ItemsView(MapView):
+    """View of the (key, value) pairs of a HashMap."""
+
+    def __iter__(self):
+        """Return a new iterator over (key, value) tuples."""
+        return ((entry.key, entry.value) for entry in self._entries())
+
+    def __contains__(self, item: tuple) -> bool:
+        """Membership is a single lookup, not a scan."""
+        key, value = item
+        return self._map.contains_key(key) and self._map.get(key) == value
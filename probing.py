@@ -0,0 +1,277 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Probing strategies for the open addressing HashMap (hash_map_oa.HashMap).
+#              A strategy owns the probe loop for lookups, inserts and deletes over a
+#              DynamicArray of HashEntry objects whose hash_value is cached.
+
+from a6_include import DynamicArray, HashEntry
+
+
+class ProbingException(Exception):
+    pass
+
+
+class ProbingStrategy:
+    """
+    Base class for strategies that delete by leaving a tombstone.
+    Subclasses only define _next_index(); the probe loops live here.
+    """
+
+    name = None
+    uses_tombstones = True
+    # Kind of capacity ('prime' or 'power_of_two') the probe sequence needs to reach
+    # enough slots, or None if any capacity works (see capacity.CapacityPolicy).
+    capacity_kind = None
+    # Highest probe load at which an insert is still sure to find a free slot.
+    max_load = 1.0
+
+    def __str__(self) -> str:
+        """Return the strategy name."""
+        return self.name
+
+    def _next_index(self, initial_index: int, count: int, hash_value: int, capacity: int) -> int:
+        """
+        Return the slot to look at on probe step count (count >= 1).
+        :param initial_index: Home slot, hash_value % capacity.
+        :param count: Probe step number.
+        :param hash_value: Cached hash of the key being probed for.
+        :param capacity: Capacity of the bucket array.
+        :return: Slot index.
+        """
+        raise NotImplementedError
+
+    def probe(self, buckets: DynamicArray, capacity: int, key: str, hash_value: int) -> (int, bool, int):
+        """
+        Search one bucket array for the given key. Cached hashes are compared before keys,
+        so colliding entries are skipped without a key comparison.
+        :param buckets: Bucket array to search.
+        :param capacity: Capacity of that bucket array.
+        :param key: Key to search for.
+        :param hash_value: Result of the hash function for key.
+        :return: Tuple: (index of the live entry, True, probes) if the key is present, otherwise
+                 (index of the first tombstone or empty slot on the probe path, False, probes),
+                 where probes is the number of steps taken to reach that index.
+        """
+        next_index = self._next_index
+        get_at_index = buckets.get_at_index
+        initial_index = hash_value % capacity
+        index = initial_index
+        free = None
+        free_count = 0
+        count = 1
+        entry = get_at_index(index)
+        while entry and count <= capacity:
+            if entry.is_tombstone:
+                if free is None:
+                    free, free_count = index, count - 1
+            elif entry.hash_value == hash_value and entry.key == key:
+                return index, True, count - 1
+            index = next_index(initial_index, count, hash_value, capacity)
+            count += 1
+            entry = get_at_index(index)
+        if free is None:
+            return index, False, count - 1
+        return free, False, free_count
+
+    def insert(self, buckets: DynamicArray, capacity: int, index: int, entry: HashEntry,
+               probes: int) -> (bool, int):
+        """
+        Store a new entry at the slot probe() returned for its key.
+        :param buckets: Bucket array to write.
+        :param capacity: Capacity of that bucket array.
+        :param index: Slot returned by probe().
+        :param entry: HashEntry to store.
+        :param probes: Probe count returned by probe().
+        :return: Tuple: (True if a tombstone was reused, longest probe length produced).
+        """
+        reused = buckets.get_at_index(index) is not None
+        buckets.set_at_index(index, entry)
+        return reused, probes
+
+    def place(self, buckets: DynamicArray, capacity: int, entry: HashEntry) -> int:
+        """
+        Store an entry whose key is known to be absent in the first empty slot on its
+        probe path, with no key comparisons. Used to rehash into a fresh table.
+        :param buckets: Bucket array to write.
+        :param capacity: Capacity of that bucket array.
+        :param entry: HashEntry to store.
+        :return: Longest probe length produced.
+        """
+        next_index = self._next_index
+        get_at_index = buckets.get_at_index
+        hash_value = entry.hash_value
+        initial_index = hash_value % capacity
+        index = initial_index
+        count = 1
+        while get_at_index(index) is not None:
+            if count > capacity:
+                raise ProbingException(f"no empty slot on the {self.name} probe path")
+            index = next_index(initial_index, count, hash_value, capacity)
+            count += 1
+        buckets.set_at_index(index, entry)
+        return count - 1
+
+    def remove(self, buckets: DynamicArray, capacity: int, index: int) -> bool:
+        """
+        Delete the live entry at index.
+        :param buckets: Bucket array to modify.
+        :param capacity: Capacity of that bucket array.
+        :param index: Slot of the entry to delete.
+        :return: True if a tombstone was left behind, False if the slot was emptied.
+        """
+        buckets.get_at_index(index).is_tombstone = True
+        return True
+
+
+class LinearProbing(ProbingStrategy):
+    """Probe consecutive slots: home, home + 1, home + 2, ..."""
+
+    name = 'linear'
+
+    def _next_index(self, initial_index: int, count: int, hash_value: int, capacity: int) -> int:
+        """Step count of a linear probe."""
+        return (initial_index + count) % capacity
+
+
+class QuadraticProbing(ProbingStrategy):
+    """
+    Probe home + 1, home + 4, home + 9, ... (the HashMap's original behavior).
+    On a prime capacity the first half of the sequence hits distinct slots.
+    """
+
+    name = 'quadratic'
+    capacity_kind = 'prime'
+    max_load = 0.5
+
+    def _next_index(self, initial_index: int, count: int, hash_value: int, capacity: int) -> int:
+        """Step count of a quadratic probe."""
+        return (initial_index + count**2) % capacity
+
+
+class TriangularProbing(ProbingStrategy):
+    """
+    Probe home + 1, home + 3, home + 6, ... (steps of 1, 2, 3, ...). The quadratic
+    probe for power-of-two capacities, where it visits every slot.
+    """
+
+    name = 'triangular'
+    capacity_kind = 'power_of_two'
+
+    def _next_index(self, initial_index: int, count: int, hash_value: int, capacity: int) -> int:
+        """Step count of a triangular probe."""
+        return (initial_index + count * (count + 1) // 2) % capacity
+
+
+class DoubleHashing(ProbingStrategy):
+    """
+    Probe home + k * step, where step comes from the high part of the hash.
+    With a prime capacity every step size visits every slot.
+    """
+
+    name = 'double'
+    capacity_kind = 'prime'
+
+    def _next_index(self, initial_index: int, count: int, hash_value: int, capacity: int) -> int:
+        """Step count of a double hashing probe."""
+        step = 1 + (hash_value // capacity) % (capacity - 1) if capacity > 1 else 1
+        return (initial_index + count * step) % capacity
+
+
+class RobinHoodProbing(ProbingStrategy):
+    """
+    Linear probing with Robin Hood insertion: an entry that has travelled further from its
+    home slot takes the place of one that has travelled less. This keeps probe lengths close
+    to the mean, lets lookups stop early, and allows backward-shift deletion, which needs no
+    tombstones.
+    """
+
+    name = 'robin_hood'
+    uses_tombstones = False
+
+    def probe(self, buckets: DynamicArray, capacity: int, key: str, hash_value: int) -> (int, bool, int):
+        """
+        Search for the given key, stopping at the first resident that is closer to its home
+        than the key would be at that slot.
+        :param buckets: Bucket array to search.
+        :param capacity: Capacity of that bucket array.
+        :param key: Key to search for.
+        :param hash_value: Result of the hash function for key.
+        :return: Tuple: (index of the live entry, True, distance) if the key is present, otherwise
+                 (slot where the key belongs, False, distance from home to that slot).
+        """
+        get_at_index = buckets.get_at_index
+        index = hash_value % capacity
+        distance = 0
+        entry = get_at_index(index)
+        while entry is not None and distance < capacity:
+            # Tombstones only occur in an old table during an incremental resize.
+            if not entry.is_tombstone:
+                if entry.hash_value == hash_value and entry.key == key:
+                    return index, True, distance
+                if (index - entry.hash_value % capacity) % capacity < distance:
+                    break
+            index = (index + 1) % capacity
+            distance += 1
+            entry = get_at_index(index)
+        return index, False, distance
+
+    def insert(self, buckets: DynamicArray, capacity: int, index: int, entry: HashEntry,
+               probes: int) -> (bool, int):
+        """
+        Store a new entry at the slot probe() returned, pushing richer residents forward.
+        :param buckets: Bucket array to write.
+        :param capacity: Capacity of that bucket array.
+        :param index: Slot returned by probe().
+        :param entry: HashEntry to store.
+        :param probes: Distance returned by probe().
+        :return: Tuple: (False, longest distance produced).
+        """
+        get_at_index = buckets.get_at_index
+        set_at_index = buckets.set_at_index
+        distance = probes
+        longest = probes
+        resident = get_at_index(index)
+        while resident is not None:
+            if distance >= capacity:
+                raise ProbingException("no empty slot on the robin_hood probe path")
+            resident_distance = (index - resident.hash_value % capacity) % capacity
+            if resident_distance < distance:
+                set_at_index(index, entry)
+                entry, distance = resident, resident_distance
+            index = (index + 1) % capacity
+            distance += 1
+            if distance > longest:
+                longest = distance
+            resident = get_at_index(index)
+        set_at_index(index, entry)
+        return False, longest
+
+    def place(self, buckets: DynamicArray, capacity: int, entry: HashEntry) -> int:
+        """
+        Store an entry whose key is known to be absent, starting from its home slot.
+        :param buckets: Bucket array to write.
+        :param capacity: Capacity of that bucket array.
+        :param entry: HashEntry to store.
+        :return: Longest distance produced.
+        """
+        return self.insert(buckets, capacity, entry.hash_value % capacity, entry, 0)[1]
+
+    def remove(self, buckets: DynamicArray, capacity: int, index: int) -> bool:
+        """
+        Delete the entry at index by shifting the rest of its run back one slot.
+        :param buckets: Bucket array to modify.
+        :param capacity: Capacity of that bucket array.
+        :param index: Slot of the entry to delete.
+        :return: False, no tombstone is ever left.
+        """
+        get_at_index = buckets.get_at_index
+        set_at_index = buckets.set_at_index
+        next_index = (index + 1) % capacity
+        entry = get_at_index(next_index)
+        while entry is not None and (next_index - entry.hash_value % capacity) % capacity > 0:
+            set_at_index(index, entry)
+            index = next_index
+            next_index = (next_index + 1) % capacity
+            entry = get_at_index(next_index)
+        set_at_index(index, None)
+        return False
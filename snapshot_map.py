@@ -0,0 +1,126 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Read-mostly hashmap. Readers call get/contains_key on the current published
+#              HashMap (separate chaining or open addressing) without taking any lock. Writers
+#              queue puts and removes, and publish() applies the batch to a copy-on-write copy
+#              of that map, which shares every chain or entry the batch does not touch, and
+#              then swaps it in with a single reference assignment.
+
+from threading import Lock
+
+import hash_map_sc
+from a6_include import hash_function_1
+
+
+class SnapshotHashMap:
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1,
+                 engine=hash_map_sc.HashMap) -> None:
+        """
+        Initialize an empty map with one published snapshot.
+        :param capacity: Initial capacity of the underlying HashMap.
+        :param function: Hash function used for keys.
+        :param engine: HashMap class to build on, hash_map_sc.HashMap or hash_map_oa.HashMap.
+                       It must not be in incremental resize mode, since gets would then
+                       migrate entries.
+        """
+        self._current = engine(capacity, function)
+        self._pending = []
+        self._writer_lock = Lock()
+
+    def __str__(self) -> str:
+        """Override string method to show the current snapshot."""
+        return str(self._current)
+
+    # ------------------------- readers (no locking) ------------------------- #
+
+    def snapshot(self):
+        """
+        Returns the current published HashMap. It is never modified after publication,
+        so several lookups on it see one consistent version. Treat it as read-only.
+        :return: HashMap
+        """
+        return self._current
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with key in the current snapshot.
+        :param key: Key to search for.
+        :return: Value or None.
+        """
+        return self._current.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Boolean if key is in the current snapshot.
+        :param key: Key to be searched for.
+        :return: Boolean
+        """
+        return self._current.contains_key(key)
+
+    def get_size(self) -> int:
+        """
+        Returns the size of the current snapshot.
+        :return: Size of map
+        """
+        return self._current.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Returns the capacity of the current snapshot.
+        :return: Capacity of map
+        """
+        return self._current.get_capacity()
+
+    def table_load(self) -> float:
+        """
+        Returns the table load of the current snapshot.
+        :return: Float of table load.
+        """
+        return self._current.table_load()
+
+    # -------------------------------- writers ------------------------------- #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Queues key/value to be added or updated by the next publish().
+        :param key: Key to be added/updated.
+        :param value: Value to associate with key.
+        :return: None
+        """
+        with self._writer_lock:
+            self._pending.append((key, value, False))
+
+    def remove(self, key: str) -> None:
+        """
+        Queues key to be removed by the next publish().
+        :param key: Key to be removed.
+        :return: None
+        """
+        with self._writer_lock:
+            self._pending.append((key, None, True))
+
+    def pending(self) -> int:
+        """
+        Returns the number of queued operations not yet published.
+        :return: Number of pending puts and removes
+        """
+        return len(self._pending)
+
+    def publish(self) -> None:
+        """
+        Applies every queued put/remove, in order, to a copy-on-write copy of the current
+        snapshot and makes that copy the new snapshot. Readers see either the old version
+        or the new one, never a partly applied batch.
+        :return: None
+        """
+        with self._writer_lock:
+            ops, self._pending = self._pending, []
+            if not ops:
+                return
+            new_map = self._current.copy_on_write([op[0] for op in ops])
+            for key, value, removing in ops:
+                if removing:
+                    new_map.remove(key)
+                else:
+                    new_map.put(key, value)
+            self._current = new_map
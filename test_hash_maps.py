@@ -0,0 +1,1041 @@
+# Course: CS261 - Data Structures
+# Assignment: 6 - Hashmaps
+# Description: Randomized checks of both HashMaps (and the compact OA map) against a
+#              dict, in every engine mode: capacity policies (with and without shrinking),
+#              probing strategies, incremental resize, flood guard, sorted buckets,
+#              copy_on_write() (and SnapshotHashMap on top of it) and dump()/load().
+#              After every batch of operations the maps' bookkeeping (get_size(),
+#              empty_buckets(), tombstones(), longest_chain()) is compared against a full
+#              scan of the table.
+#
+# Usage: python -m pytest test_hash_maps.py  (or python test_hash_maps.py)
+
+import io
+import os
+import pickle
+import random
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+from threading import Thread
+from unittest import mock
+from itertools import islice, permutations
+
+import hash_map_compact
+import hash_map_dump
+import hash_map_mmap
+import hash_map_oa
+import hash_map_sc
+import probing
+from a6_include import (DynamicArray, DynamicArrayException, LinkedList, SortedBucket,
+                        hash_function_1, hash_function_2, hash_function_fnv1a, hash_function_id,
+                        hash_function_xx, seeded_hash_function, sip_hash)
+from capacity import PowerOfTwoCapacity, PrimeCapacity, PrimeLadderCapacity
+from concurrent_map import ShardedHashMap
+from map_stats import MapStats
+from snapshot_map import SnapshotHashMap
+
+POLICIES = (
+    lambda: None,
+    lambda: PrimeLadderCapacity(),
+    lambda: PowerOfTwoCapacity(),
+    lambda: PrimeLadderCapacity(shrink_at=0.1),
+    lambda: PowerOfTwoCapacity(shrink_at=0.1),
+)
+
+STRATEGIES = (
+    lambda: None,
+    probing.LinearProbing,
+    probing.QuadraticProbing,
+    probing.TriangularProbing,
+    probing.DoubleHashing,
+    probing.RobinHoodProbing,
+)
+
+
+class _CallsOnLoad:
+    """Pickles as a call to print(), which a dump must never make on load."""
+
+    def __reduce__(self):
+        return print, ('loaded',)
+
+
+def sc_configs():
+    """Yields (description, factory) for every separate chaining mode."""
+    for function in (hash_function_1, hash_function_2, hash_function_fnv1a):
+        for policy in POLICIES:
+            for flood_guard in (False, True):
+                description = f"SC {function.__name__} {policy()} flood_guard={flood_guard}"
+                yield description, (lambda function=function, policy=policy, flood_guard=flood_guard:
+                                    hash_map_sc.HashMap(7, function, policy=policy(),
+                                                        flood_guard=flood_guard))
+
+
+def oa_configs():
+    """Yields (description, factory) for every open addressing mode that can be built."""
+    for strategy in STRATEGIES:
+        for policy in POLICIES:
+            for incremental in (False, True):
+                for flood_guard in (False, True):
+                    def factory(strategy=strategy, policy=policy, incremental=incremental,
+                                flood_guard=flood_guard):
+                        return hash_map_oa.HashMap(7, hash_function_2, incremental=incremental,
+                                                   probing=strategy(), policy=policy(),
+                                                   flood_guard=flood_guard)
+                    try:
+                        factory()
+                    except ValueError:
+                        # Strategy and policy do not fit together (e.g. quadratic on powers of two).
+                        continue
+                    description = (f"OA {strategy() or 'default'} {policy()} "
+                                   f"incremental={incremental} flood_guard={flood_guard}")
+                    yield description, factory
+
+
+def scan_sc(test: unittest.TestCase, m: hash_map_sc.HashMap) -> None:
+    """Checks the separate chaining map's counters against a full scan of its buckets."""
+    lengths = []
+    for index in range(m.get_capacity()):
+        bucket = m._buckets.get_at_index(index)
+        lengths.append(bucket.length())
+        for node in bucket:
+            test.assertEqual(node.hash_value, m._hash(node.key))
+            test.assertEqual(node.hash_value % m.get_capacity(), index)
+        if type(bucket) is SortedBucket:
+            test.assertGreater(bucket.length(), m._UNTREEIFY_THRESHOLD)
+    test.assertEqual(m.get_size(), sum(lengths))
+    test.assertEqual(m.empty_buckets(), lengths.count(0))
+    test.assertEqual(m.longest_chain(), max(lengths))
+
+
+def scan_oa(test: unittest.TestCase, m: hash_map_oa.HashMap) -> None:
+    """
+    Checks the open addressing map's counters against a full scan of its slots, and of
+    the old table while an incremental resize is in progress.
+    """
+    slots = [m._buckets.get_at_index(index) for index in range(m.get_capacity())]
+    live = [entry for entry in slots if entry is not None and not entry.is_tombstone]
+    for entry in live:
+        test.assertEqual(entry.hash_value, m._hash(entry.key))
+    test.assertEqual(m.empty_buckets(), slots.count(None))
+    test.assertEqual(m.tombstones(), sum(1 for entry in slots if entry is not None and entry.is_tombstone))
+    if m._old_buckets is not None:
+        live.extend(entry for entry in m._old_buckets
+                    if entry is not None and not entry.is_tombstone)
+    test.assertEqual(m.get_size(), len(live))
+
+
+def contents(m) -> dict:
+    """Returns the map's pairs as a dict, checking that get_keys_and_values() has no duplicates."""
+    pairs = m.get_keys_and_values()
+    result = {pairs[i][0]: pairs[i][1] for i in range(pairs.length())}
+    assert len(result) == pairs.length() == m.get_size()
+    return result
+
+
+def exercise(test: unittest.TestCase, m, scan, seed: int, steps: int = 1500,
+             keyspace: int = 300) -> dict:
+    """
+    Runs random operations on m and on a dict side by side, scanning the map every 100 steps.
+    Keys are drawn from a small space, so most steps hit existing keys and removes
+    leave tombstones (and shrink tables under shrinking policies).
+    :return: The reference dict.
+    """
+    rng = random.Random(seed)
+    ref = {}
+    for step in range(steps):
+        key = 'k' + str(rng.randrange(keyspace))
+        op = rng.randrange(10)
+        if op < 3:
+            m.put(key, step)
+            ref[key] = step
+        elif op == 3:
+            m.remove(key)
+            ref.pop(key, None)
+        elif op == 4:
+            test.assertEqual(m.pop(key, 'absent'), ref.pop(key, 'absent'))
+        elif op == 5:
+            # Removes the key when it holds an even value, otherwise adds or bumps it.
+            new = m.compute(key, lambda old: None if old is not None and old % 2 == 0 else step)
+            if key in ref and ref[key] % 2 == 0:
+                del ref[key]
+            else:
+                ref[key] = step
+            test.assertEqual(new, ref.get(key))
+        elif op == 6:
+            test.assertEqual(m.increment(key, 2), ref.get(key, 0) + 2)
+            ref[key] = ref.get(key, 0) + 2
+        elif op == 7:
+            test.assertEqual(m.setdefault(key, step), ref.setdefault(key, step))
+        elif op == 8:
+            test.assertEqual(m.get(key), ref.get(key))
+        else:
+            test.assertEqual(m.contains_key(key), key in ref)
+        test.assertEqual(m.get_size(), len(ref))
+        if step % 100 == 99:
+            scan(test, m)
+    # Bulk operations on top of the same state.
+    pairs = [('k' + str(rng.randrange(keyspace * 2)), -i) for i in range(keyspace)]
+    m.put_many(pairs)
+    ref.update(pairs)
+    keys = ['k' + str(i) for i in range(keyspace * 2)]
+    found = m.get_many(keys)
+    present = m.contains_many(keys)
+    for i, key in enumerate(keys):
+        test.assertEqual(found[i], ref.get(key))
+        test.assertEqual(present[i], key in ref)
+    scan(test, m)
+    test.assertEqual(contents(m), ref)
+    return ref
+
+
+class HashMapModesTest(unittest.TestCase):
+
+    def check_modes(self, configs, scan) -> None:
+        """Runs exercise() on a map from every config, then copy_on_write() and dump()/load()."""
+        for seed, (description, factory) in enumerate(configs):
+            with self.subTest(description):
+                m = factory()
+                ref = exercise(self, m, scan, seed)
+
+                # A copy_on_write() copy may change the given keys without touching m.
+                changed = ['k' + str(i) for i in range(0, 40, 3)]
+                copy = m.copy_on_write(changed, growth=len(changed))
+                for i, key in enumerate(changed):
+                    if i % 2:
+                        copy.remove(key)
+                    else:
+                        copy.put(key, 'copied')
+                self.assertEqual(contents(m), ref)
+                scan(self, m)
+                scan(self, copy)
+
+                # A dump loads back into a map of the same mode, and into a default one.
+                buffer = io.BytesIO()
+                m.dump(buffer)
+                for target in (factory(), type(m)(7, hash_function_1)):
+                    buffer.seek(0)
+                    target.load(buffer)
+                    self.assertEqual(contents(target), ref)
+                    scan(self, target)
+                    for key, value in ref.items():
+                        self.assertEqual(target.get(key), value)
+
+    def test_separate_chaining_modes(self) -> None:
+        self.check_modes(sc_configs(), scan_sc)
+
+    def test_open_addressing_modes(self) -> None:
+        self.check_modes(oa_configs(), scan_oa)
+
+    def test_sorted_buckets(self) -> None:
+        # hash_function_1 gives every permutation of one word the same hash.
+        keys = [''.join(p) for p in islice(permutations('abcdefg'), 40)]
+        m = hash_map_sc.HashMap(11, hash_function_1)
+        for i, key in enumerate(keys):
+            m.put(key, i)
+        bucket = m._buckets.get_at_index(m._hash(keys[0]) % m.get_capacity())
+        self.assertIs(type(bucket), SortedBucket)
+        for i, key in enumerate(keys):
+            self.assertEqual(m.get(key), i)
+        for key in keys[:35]:
+            m.remove(key)
+        bucket = m._buckets.get_at_index(m._hash(keys[0]) % m.get_capacity())
+        self.assertIsNot(type(bucket), SortedBucket)
+        self.assertEqual(contents(m), {key: i for i, key in enumerate(keys) if i >= 35})
+        scan_sc(self, m)
+
+    def test_sorted_bucket_keys_without_total_order(self) -> None:
+        # < on frozensets is a subset test, so (hash, key) order cannot be binary searched.
+        bucket = SortedBucket()
+        for key in ('b', 'a', 'c'):
+            bucket.insert(key, key, 7)
+        keys = [frozenset({1}), frozenset({2}), frozenset({1, 2}), frozenset(), (1, 2), float('nan')]
+        for key in keys:
+            bucket.insert(key, None, 7)
+        for key in ('a', 'b', 'c') + tuple(keys[:-1]):
+            self.assertIsNotNone(bucket.contains(key, 7))
+        for key in keys[:-1]:
+            self.assertTrue(bucket.remove(key, 7))
+        self.assertEqual(sorted(node.key for node in bucket if type(node.key) is str), ['a', 'b', 'c'])
+
+    def test_flood_guard_reseeds(self) -> None:
+        keys = [''.join(p) for p in islice(permutations('abcdefghijk'), 500)]
+        for m, scan in ((hash_map_sc.HashMap(11, hash_function_1, flood_guard=True), scan_sc),
+                        (hash_map_oa.HashMap(11, hash_function_1, flood_guard=True), scan_oa)):
+            with self.subTest(type(m).__module__):
+                for i, key in enumerate(keys):
+                    m.put(key, i)
+                self.assertNotEqual(hash_function_id(m._hash_function), hash_function_id(hash_function_1))
+                self.assertEqual(contents(m), {key: i for i, key in enumerate(keys)})
+                scan(self, m)
+
+    def test_incremental_resize_keeps_every_key(self) -> None:
+        m = hash_map_oa.HashMap(7, hash_function_fnv1a, incremental=True)
+        ref = {}
+        for i in range(3000):
+            m.put('k' + str(i), i)
+            ref['k' + str(i)] = i
+            if i % 7 == 0:
+                m.remove('k' + str(i // 2))
+                ref.pop('k' + str(i // 2), None)
+            if m._old_buckets is not None:
+                # Mid-migration, keys are found in whichever table holds them.
+                self.assertEqual(m.get('k' + str(i)), i)
+                scan_oa(self, m)
+        self.assertEqual(contents(m), ref)
+
+    def test_bulk_calls_do_not_stall_a_migration(self) -> None:
+        m = hash_map_oa.HashMap(7, hash_function_fnv1a, incremental=True)
+        ref = {}
+        i = 0
+        while m._old_buckets is None or m._old_capacity < 500:
+            m.put('k' + str(i), i)
+            ref['k' + str(i)] = i
+            i += 1
+        keys = ['k0', 'k' + str(i - 1), 'k' + str(i // 2), 'missing']
+        self.assertEqual(list(m.get_many(keys)), [ref.get(key) for key in keys])
+        self.assertEqual(list(m.contains_many(keys)), [key in ref for key in keys])
+        m.put_many([('k1', 'one'), ('k' + str(i // 3), 'third'), ('new', 'n')])
+        ref.update({'k1': 'one', 'k' + str(i // 3): 'third', 'new': 'n'})
+        # Each bulk call moved one step of the old table, not all of it.
+        self.assertIsNotNone(m._old_buckets)
+
+        buffer = io.BytesIO()
+        m.dump(buffer)
+        self.assertIsNotNone(m._old_buckets)
+        buffer.seek(0)
+        target = hash_map_oa.HashMap(7, hash_function_fnv1a, incremental=True)
+        target.load(buffer)
+        self.assertEqual(contents(target), ref)
+        scan_oa(self, target)
+
+        next(iter(m.keys()))
+        self.assertIsNotNone(m._old_buckets)
+        self.assertEqual(sorted(m.keys()), sorted(ref))
+        self.assertIsNone(m._old_buckets)
+        self.assertEqual(contents(m), ref)
+        scan_oa(self, m)
+
+    def test_bulk_operations_record_stats(self) -> None:
+        # With stats enabled the bulk calls take the single-key paths; both must agree.
+        pairs = [('k' + str(i % 700), i) for i in range(1000)]
+        keys = ['k' + str(i) for i in range(0, 1400, 3)]
+        for module in (hash_map_sc, hash_map_oa):
+            with self.subTest(module.__name__):
+                plain = module.HashMap(11, hash_function_fnv1a)
+                timed = module.HashMap(11, hash_function_fnv1a)
+                timed.enable_stats()
+                for m in (plain, timed):
+                    m.put_many(pairs)
+                self.assertEqual(contents(timed), contents(plain))
+                self.assertEqual(list(timed.get_many(keys)), list(plain.get_many(keys)))
+                self.assertEqual(list(timed.contains_many(keys)), list(plain.contains_many(keys)))
+                operations = timed._stats.snapshot()['operations']
+                self.assertEqual(operations, {'put_many': len(pairs), 'get_many': len(keys),
+                                              'contains_many': len(keys)})
+
+    def test_from_items_and_reserve(self) -> None:
+        # Repeated keys: the later pair wins, as in dict().
+        items = [('k' + str(i % 1500), i) for i in range(2000)]
+        ref = dict(items)
+        for module in (hash_map_sc, hash_map_oa):
+            with self.subTest(module.__name__):
+                sized = module.HashMap(11, hash_function_fnv1a)
+                sized.reserve(len(items))
+                capacity = sized.get_capacity()
+                self.assertGreater(capacity, 11)
+                # Sized once up front, whether the length is known or given.
+                for m in (module.HashMap.from_items(items, hash_function_fnv1a),
+                          module.HashMap.from_items(iter(items), hash_function_fnv1a, len(items)),
+                          module.HashMap.from_items(DynamicArray(items), hash_function_fnv1a)):
+                    self.assertEqual(contents(m), ref)
+                    self.assertEqual(m.get_capacity(), capacity)
+                # A generator without expected_size still builds the same map.
+                m = module.HashMap.from_items((pair for pair in items), hash_function_fnv1a)
+                self.assertEqual(contents(m), ref)
+                # So does an expected_size that is too low; it just resizes along the way.
+                m = module.HashMap.from_items(iter(items), hash_function_fnv1a, 10)
+                self.assertEqual(contents(m), ref)
+
+                # reserve() takes the total number of entries, resizes once and never shrinks.
+                m = module.HashMap(11, hash_function_fnv1a)
+                m.put_many(items[:100])
+                m.enable_stats()
+                m.reserve(len(items))
+                m.reserve(1)
+                m.put_many(items[100:])
+                self.assertEqual(contents(m), ref)
+                self.assertEqual(len(m.stats()['resizes']), 1)
+
+    def test_copy_on_write_leaves_the_original_alone(self) -> None:
+        # Enough puts to grow the copy, or enough removes to shrink it, while most chains
+        # and entries stay shared with the original.
+        batches = ((['n' + str(i) for i in range(150)], []),
+                   ([], ['k' + str(i) for i in range(185)]))
+        for module, (added, removed) in zip((hash_map_sc, hash_map_oa) * 2, batches * 2):
+            with self.subTest(module.__name__, added=len(added), removed=len(removed)):
+                m = module.HashMap(11, hash_function_fnv1a, policy=PrimeLadderCapacity(shrink_at=0.1))
+                m.put_many([('k' + str(i), i) for i in range(200)])
+                m.enable_stats()
+                before = contents(m)
+                capacity = m.get_capacity()
+                copy = m.copy_on_write(added + removed)
+                for key in added:
+                    copy.put(key, key)
+                for key in removed:
+                    copy.remove(key)
+                expected = dict(before, **{key: key for key in added})
+                for key in removed:
+                    del expected[key]
+                self.assertEqual(contents(copy), expected)
+                self.assertNotEqual(copy.get_capacity(), capacity)
+                self.assertEqual(contents(m), before)
+                self.assertEqual(m.get_capacity(), capacity)
+                # Each map records its own stats.
+                self.assertIsNot(copy._stats, m._stats)
+                self.assertEqual(m._stats.snapshot()['operations'], {})
+                scan = scan_sc if module is hash_map_sc else scan_oa
+                scan(self, m)
+                scan(self, copy)
+
+    def test_snapshot_map_publishes_batches(self) -> None:
+        for engine in (hash_map_sc.HashMap, hash_map_oa.HashMap):
+            with self.subTest(engine.__module__):
+                m = SnapshotHashMap(11, hash_function_fnv1a, engine)
+                rng = random.Random(5)
+                ref = {}
+                for batch in range(30):
+                    published = dict(ref)
+                    old = m.snapshot()
+                    for _ in range(rng.randrange(1, 40)):
+                        key = 'k' + str(rng.randrange(150))
+                        if rng.randrange(3):
+                            m.put(key, batch)
+                            ref[key] = batch
+                        else:
+                            m.remove(key)
+                            ref.pop(key, None)
+                    # Nothing is visible before publish().
+                    self.assertEqual(contents(m.snapshot()), published)
+                    self.assertGreater(m.pending(), 0)
+                    m.publish()
+                    self.assertEqual(m.pending(), 0)
+                    self.assertEqual(contents(m.snapshot()), ref)
+                    self.assertEqual(contents(old), published)
+                    for key in ('k' + str(i) for i in range(150)):
+                        self.assertEqual(m.get(key), ref.get(key))
+                        self.assertEqual(m.contains_key(key), key in ref)
+                    self.assertEqual(m.get_size(), len(ref))
+
+    def test_views_match_dict(self) -> None:
+        for module in (hash_map_sc, hash_map_oa):
+            with self.subTest(module.__name__):
+                m = module.HashMap(11, hash_function_fnv1a)
+                ref = {}
+                for i in range(300):
+                    m.put('k' + str(i % 170), i)
+                    ref['k' + str(i % 170)] = i
+                self.assertEqual(sorted(m.keys()), sorted(ref.keys()))
+                self.assertEqual(sorted(m.values()), sorted(ref.values()))
+                self.assertEqual(sorted(m.items()), sorted(ref.items()))
+                self.assertEqual(len(m.keys()), len(ref))
+                self.assertIn('k5', m.keys())
+                self.assertNotIn('k500', m.keys())
+                self.assertIn(('k5', ref['k5']), m.items())
+                self.assertNotIn(('k5', -1), m.items())
+                # Views are live, and each iter() is independent, so they nest.
+                keys = m.keys()
+                m.put('new', 1)
+                self.assertIn('new', list(keys))
+                self.assertEqual(sum(1 for _ in keys for _ in keys), len(keys) ** 2)
+                # Updating values during iteration is allowed.
+                for key in m.keys():
+                    m.put(key, 0)
+                self.assertEqual(set(m.values()), {0})
+
+    def test_views_refuse_changes_during_iteration(self) -> None:
+        for module in (hash_map_sc, hash_map_oa):
+            for change in (lambda m: m.put('new', 1), lambda m: m.remove('k3'), lambda m: m.clear(),
+                           lambda m: m.resize_table(m.get_capacity() * 4)):
+                with self.subTest(module.__name__):
+                    m = module.HashMap(11, hash_function_fnv1a)
+                    m.put_many([('k' + str(i), i) for i in range(20)])
+                    iterator = iter(m.items())
+                    next(iterator)
+                    change(m)
+                    with self.assertRaises(RuntimeError):
+                        list(iterator)
+
+            with self.subTest(module.__name__, map='empty'):
+                # A change while the walk is past the last entry is caught too.
+                m = module.HashMap(11, hash_function_fnv1a)
+
+                def buckets_then_change(buckets):
+                    yield from buckets
+                    m._version += 1
+
+                with mock.patch.object(m, '_buckets', buckets_then_change(m._buckets)):
+                    with self.assertRaises(RuntimeError):
+                        list(m.keys())
+
+    def test_upsert_semantics(self) -> None:
+        for module in (hash_map_sc, hash_map_oa):
+            with self.subTest(module.__name__):
+                calls = []
+
+                def counting_hash(key: str) -> int:
+                    calls.append(key)
+                    return hash_function_fnv1a(key)
+
+                m = module.HashMap(101, counting_hash)
+                self.assertEqual(m.setdefault('a', 1), 1)
+                self.assertEqual(m.setdefault('a', 2), 1)
+                self.assertEqual(m.get_or_insert('b', lambda: [0]), [0])
+                self.assertEqual(m.get_or_insert('b', lambda: self.fail("factory called")), [0])
+                self.assertEqual(m.increment('c'), 1)
+                self.assertEqual(m.increment('c', -5), -4)
+                # compute() sees None for an absent key; returning None removes (or skips) it.
+                seen = []
+                self.assertIsNone(m.compute('d', lambda old: seen.append(old)))
+                self.assertEqual(seen, [None])
+                self.assertFalse(m.contains_key('d'))
+                self.assertEqual(m.compute('d', lambda old: 'new'), 'new')
+                self.assertEqual(m.compute('d', lambda old: old + '!'), 'new!')
+                self.assertIsNone(m.compute('a', lambda old: None))
+                self.assertEqual(contents(m), {'b': [0], 'c': -4, 'd': 'new!'})
+                # Each of them hashes the key once: one lookup, then the insert or update.
+                self.assertEqual(calls, ['a', 'a', 'b', 'b', 'c', 'c', 'd', 'd', 'd', 'd', 'a'])
+
+    def test_compact_map_matches_dict(self) -> None:
+        for function in (hash_function_1, hash_function_2, hash_function_fnv1a):
+            with self.subTest(function.__name__):
+                m = hash_map_compact.HashMap(7, function)
+                rng = random.Random(3)
+                ref = {}
+                for step in range(3000):
+                    key = 'k' + str(rng.randrange(400))
+                    op = rng.randrange(6)
+                    if op < 3:
+                        m.put(key, step)
+                        ref[key] = step
+                    elif op == 3:
+                        m.remove(key)
+                        ref.pop(key, None)
+                    elif op == 4:
+                        self.assertEqual(m.get(key), ref.get(key))
+                    else:
+                        self.assertEqual(m.contains_key(key), key in ref)
+                    self.assertEqual(m.get_size(), len(ref))
+                    if step % 250 == 249:
+                        self.assertEqual(m.empty_buckets(), m._states.count(0))
+                        self.assertEqual(m.tombstones(), m._states.count(2))
+                        self.assertEqual(m.table_load(), len(ref) / m.get_capacity())
+                self.assertEqual(contents(m), ref)
+                self.assertEqual({entry.key: entry.value for entry in m}, ref)
+                m.resize_table(m.get_capacity() * 3)
+                self.assertEqual(m.tombstones(), 0)
+                self.assertEqual(contents(m), ref)
+                m.clear()
+                self.assertEqual((m.get_size(), contents(m)), (0, {}))
+
+    def test_key_types_match_dict(self) -> None:
+        rng = random.Random(25)
+        makers = (lambda i: i, lambda i: -i * 7919, lambda i: i << 70, lambda i: i + 0.5,
+                  lambda i: b'b' + str(i).encode(), lambda i: ('t', i, (i % 3, b'x')),
+                  lambda i: 'k' + str(i))
+        for module in (hash_map_sc, hash_map_oa):
+            for function in (hash_function_fnv1a, seeded_hash_function(rng.getrandbits(128))):
+                with self.subTest(module.__name__, seeded=hasattr(function, 'seed')):
+                    m = module.HashMap(11, function)
+                    ref = {}
+                    for step in range(3000):
+                        key = rng.choice(makers)(rng.randrange(400))
+                        if rng.random() < 0.7:
+                            m.put(key, step)
+                            ref[key] = step
+                        else:
+                            m.remove(key)
+                            ref.pop(key, None)
+                    self.assertEqual(contents(m), ref)
+                    for i in range(400):
+                        for make in makers:
+                            self.assertEqual(m.get(make(i)), ref.get(make(i)))
+
+                    # Keys that compare equal are one key, as in a dict, in ints, floats,
+                    # bools and inside tuples.
+                    for equal in ((1, 1.0, True), (0, -0.0, False), (2 ** 64, float(2 ** 64)),
+                                  ((1, 'a'), (1.0, 'a'), (True, 'a'))):
+                        m = module.HashMap(11, function)
+                        ref = {}
+                        for i, key in enumerate(equal):
+                            m.put(key, i)
+                            ref[key] = i
+                        self.assertEqual(m.get_size(), 1)
+                        self.assertEqual(contents(m), ref)
+                        for key in equal:
+                            self.assertEqual(m.get(key), len(equal) - 1)
+                        m.remove(equal[-1])
+                        self.assertFalse(m.contains_key(equal[0]))
+
+    def test_dump_only_holds_data(self) -> None:
+        for module, kind in ((hash_map_sc, b'S'), (hash_map_oa, b'O')):
+            with self.subTest(module.__name__):
+                m = module.HashMap(11, hash_function_1)
+                m.put('k', (1, 2.5, 3j, b'x', [None, True], {'a': frozenset({1})}))
+                m.put('bad', object())
+                with self.assertRaises(hash_map_dump.DumpFormatException):
+                    m.dump(io.BytesIO())
+                m.remove('bad')
+                buffer = io.BytesIO()
+                m.dump(buffer)
+                buffer.seek(0)
+                target = module.HashMap(11, hash_function_1)
+                target.load(buffer)
+                self.assertEqual(contents(target), contents(m))
+
+                # A chunk that would call a function on load is refused.
+                buffer = io.BytesIO()
+                hash_map_dump.write_header(buffer, kind, 11, 1, 1, 'other', '')
+                chunk = pickle.dumps([(0, 0, 'k', _CallsOnLoad())])
+                buffer.write(struct.pack('<I', len(chunk)) + chunk + struct.pack('<I', 0))
+                buffer.seek(0)
+                with self.assertRaises(hash_map_dump.DumpFormatException):
+                    target.load(buffer)
+
+    def test_load_checks_the_hash_function(self) -> None:
+        keys = ['k' + str(i) for i in range(50)]
+        for module in (hash_map_sc, hash_map_oa):
+            with self.subTest(module.__name__):
+                # Lambdas all share one name, so they have no id and load() re-puts.
+                m = module.HashMap(11, lambda key: hash_function_fnv1a(key))
+                for i, key in enumerate(keys):
+                    m.put(key, i)
+                buffer = io.BytesIO()
+                m.dump(buffer)
+                buffer.seek(0)
+                target = module.HashMap(11, lambda key: hash_function_xx(key))
+                target.load(buffer)
+                self.assertEqual(contents(target), contents(m))
+                self.assertTrue(all(target.contains_key(key) for key in keys))
+
+                # Equal ids with different hashes are caught by re-hashing a sample.
+                m = module.HashMap(11, hash_function_fnv1a)
+                for i, key in enumerate(keys):
+                    m.put(key, i)
+                buffer = io.BytesIO()
+                with mock.patch.object(module, 'hash_function_id', lambda function: 'same'):
+                    m.dump(buffer)
+                    buffer.seek(0)
+                    target = module.HashMap(11, hash_function_xx)
+                    target.load(buffer)
+                self.assertTrue(all(target.get(key) == i for i, key in enumerate(keys)))
+
+    def test_dump_flags_unstable_hashes(self) -> None:
+        for module, kind in ((hash_map_sc, b'S'), (hash_map_oa, b'O')):
+            with self.subTest(module.__name__):
+                for keys, flags in ((['a', 1, 2.5, b'x', ('a', 1)], 0),
+                                    (['a', frozenset({'a'})], hash_map_dump.UNSTABLE_HASHES)):
+                    m = module.HashMap(11, hash_function_fnv1a)
+                    for key in keys:
+                        m.put(key, 1)
+                    buffer = io.BytesIO()
+                    m.dump(buffer)
+                    buffer.seek(0)
+                    self.assertEqual(hash_map_dump.read_header(buffer, kind)[5], flags)
+                    buffer.seek(0)
+                    target = module.HashMap(11, hash_function_fnv1a)
+                    target.load(buffer)
+                    self.assertEqual(contents(target), contents(m))
+
+    def test_default_policy_is_prime(self) -> None:
+        self.assertEqual(hash_map_sc.HashMap(10, hash_function_1)._policy.name, PrimeCapacity().name)
+        self.assertEqual(hash_map_oa.HashMap(10, hash_function_1).get_capacity(), 11)
+
+
+class DynamicArrayTest(unittest.TestCase):
+    def test_matches_list(self) -> None:
+        for typecode in (None, 'q'):
+            with self.subTest(typecode=typecode):
+                da = DynamicArray([1, 2, 3], typecode)
+                ref = [1, 2, 3]
+                da.extend(DynamicArray([4, 5], typecode))
+                da.extend(range(6, 9))
+                ref.extend([4, 5, 6, 7, 8])
+                da.fill(0, 4)
+                ref.extend([0] * 4)
+                da.append(-1)
+                ref.append(-1)
+                self.assertEqual(list(da), ref)
+                self.assertEqual(da.length(), len(ref))
+                self.assertEqual([da[i] for i in range(da.length())], ref)
+
+                part = da.slice(2, 6)
+                self.assertEqual(list(part), ref[2:6])
+                part.set_at_index(0, 99)
+                self.assertEqual(da[2], ref[2])
+                self.assertEqual(list(da.slice(3, 3)), [])
+
+                da.copy_range(part, 1, 8, 3)
+                ref[8:11] = [4, 5, 6]
+                self.assertEqual(list(da), ref)
+                get = da.getter()
+                self.assertEqual([get(i) for i in range(len(ref))], ref)
+
+                for bad in (lambda: da.slice(-1, 2), lambda: da.slice(3, 2),
+                            lambda: da.slice(0, len(ref) + 1), lambda: da.get_at_index(len(ref)),
+                            lambda: da.copy_range(part, 2, 0, 3),
+                            lambda: da.copy_range(part, 0, len(ref) - 1, 2),
+                            lambda: da.copy_range(part, 0, 0, -1)):
+                    with self.assertRaises(DynamicArrayException):
+                        bad()
+
+    def test_typed_arrays_and_memoryview(self) -> None:
+        da = DynamicArray(typecode='Q')
+        da.fill(7, 5)
+        da.append((1 << 64) - 1)
+        view = da.memoryview()
+        self.assertEqual((view.format, view.itemsize, len(view)), ('Q', 8, 6))
+        self.assertEqual(view.tolist(), [7] * 5 + [(1 << 64) - 1])
+        # The view shares the storage: writes show up both ways.
+        view[0] = 1
+        da.set_at_index(1, 2)
+        self.assertEqual((da[0], view[1]), (1, 2))
+        view.release()
+        # Typed arrays hold only what their typecode can store.
+        with self.assertRaises(OverflowError):
+            da.append(-1)
+        with self.assertRaises(TypeError):
+            da.append('x')
+        self.assertEqual(str(DynamicArray([1, 2], 'B')), '[1, 2]')
+        with self.assertRaises(DynamicArrayException):
+            DynamicArray([1, 2]).memoryview()
+
+
+class MapStatsTest(unittest.TestCase):
+    def test_records_lookups_and_resizes(self) -> None:
+        keys = ['k' + str(i) for i in range(500)]
+        for module, unit in ((hash_map_sc, 'chain_walk'), (hash_map_oa, 'probes')):
+            with self.subTest(module.__name__):
+                m = module.HashMap(11, hash_function_fnv1a)
+                self.assertEqual(m.stats(), {})
+                events = []
+                m.enable_stats(lambda event, data: events.append((event, data)))
+                capacities = [m.get_capacity()]
+                for i, key in enumerate(keys):
+                    m.put(key, i)
+                    if m.get_capacity() != capacities[-1]:
+                        capacities.append(m.get_capacity())
+                for key in keys[::2] + ['missing' + str(i) for i in range(50)]:
+                    m.get(key)
+                for key in keys[:100]:
+                    m.remove(key)
+
+                stats = m.stats()
+                self.assertEqual(stats['unit'], unit)
+                self.assertEqual(stats['operations'], {'put': 500, 'get': 300, 'remove': 100})
+                self.assertEqual((stats['size'], stats['capacity']), (400, m.get_capacity()))
+                lookups = [data for event, data in events if event == 'lookup']
+                self.assertEqual(len(lookups), 900)
+                self.assertEqual(sum(stats['histogram']), 900)
+                for length, count in enumerate(stats['histogram']):
+                    self.assertEqual(sum(1 for data in lookups if data['length'] == length), count)
+                for operation, count in stats['operations'].items():
+                    lengths = [data['length'] for data in lookups if data['operation'] == operation]
+                    self.assertAlmostEqual(stats['mean_length'][operation], sum(lengths) / count)
+
+                # One resize event per capacity change, reported to the callback as recorded.
+                resizes = [data for event, data in events if event == 'resize']
+                self.assertEqual(resizes, stats['resizes'])
+                self.assertEqual([(r['old_capacity'], r['new_capacity']) for r in resizes],
+                                 list(zip(capacities, capacities[1:])))
+                self.assertGreaterEqual(stats['hash_calls'], 900)
+                self.assertGreater(stats['hash_seconds'], 0.0)
+
+                # Disabling drops everything and unwraps the hash; enabling starts over.
+                m.disable_stats()
+                self.assertIsNone(m._stats)
+                self.assertEqual(m.stats(), {})
+                self.assertEqual(m.get(keys[-1]), 499)
+                m.enable_stats()
+                m.get(keys[-1])
+                self.assertEqual(m.stats()['operations'], {'get': 1})
+                self.assertEqual(m.stats()['hash_calls'], 1)
+
+    def test_records_reseeds(self) -> None:
+        keys = [''.join(p) for p in islice(permutations('abcdefghijk'), 500)]
+        for module in (hash_map_sc, hash_map_oa):
+            with self.subTest(module.__name__):
+                m = module.HashMap(11, hash_function_1, flood_guard=True)
+                events = []
+                m.enable_stats(lambda event, data: events.append((event, data)))
+                for i, key in enumerate(keys):
+                    m.put(key, i)
+                reseeds = [data for event, data in events if event == 'reseed']
+                self.assertGreater(len(reseeds), 0)
+                self.assertEqual(m.stats()['reseeds'], len(reseeds))
+                self.assertTrue(all(data['size'] <= len(keys) for data in reseeds))
+
+    def test_chain_walk_lengths(self) -> None:
+        # A LinkedList counts the nodes walked up to the match (all of them on a miss);
+        # a SortedBucket counts the steps of its binary search.
+        chain = LinkedList()
+        for key in 'abcde':
+            chain.insert(key, None, 7)
+        stats = MapStats('chain_walk')
+        nodes = list(chain)
+        for node in nodes:
+            stats.chain_walk('get', chain, node)
+        stats.chain_walk('get', chain, None)
+        self.assertEqual(stats.histogram, [0, 1, 1, 1, 1, 2])
+
+        bucket = SortedBucket(nodes)
+        stats = MapStats('chain_walk')
+        stats.chain_walk('get', bucket, nodes[0])
+        stats.chain_walk('contains_key', bucket, None)
+        self.assertEqual(stats.snapshot()['mean_length'], {'get': 3, 'contains_key': 3})
+
+
+class ShardedHashMapTest(unittest.TestCase):
+    def test_matches_dict(self) -> None:
+        for engine in (hash_map_sc.HashMap, hash_map_oa.HashMap):
+            with self.subTest(engine.__module__):
+                m = ShardedHashMap(4, 11, hash_function_fnv1a, engine)
+                rng = random.Random(7)
+                ref = {}
+                for step in range(2000):
+                    key = 'k' + str(rng.randrange(300))
+                    op = rng.randrange(8)
+                    if op < 3:
+                        m.put(key, step)
+                        ref[key] = step
+                    elif op == 3:
+                        m.remove(key)
+                        ref.pop(key, None)
+                    elif op == 4:
+                        self.assertEqual(m.pop(key, 'absent'), ref.pop(key, 'absent'))
+                    elif op == 5:
+                        self.assertEqual(m.increment(key, 3), ref.get(key, 0) + 3)
+                        ref[key] = ref.get(key, 0) + 3
+                    elif op == 6:
+                        self.assertEqual(m.setdefault(key, step), ref.setdefault(key, step))
+                    else:
+                        self.assertEqual(m.get(key), ref.get(key))
+                        self.assertEqual(m.contains_key(key), key in ref)
+                self.assertEqual(m.get_size(), len(ref))
+                self.assertEqual(contents(m), ref)
+                self.assertEqual(m.shard_count(), 4)
+                self.assertEqual(m.table_load(), len(ref) / m.get_capacity())
+                m.clear()
+                self.assertEqual(contents(m), {})
+        with self.assertRaises(ValueError):
+            ShardedHashMap(0)
+
+    def test_concurrent_writers(self) -> None:
+        for engine in (hash_map_sc.HashMap, hash_map_oa.HashMap):
+            with self.subTest(engine.__module__):
+                m = ShardedHashMap(8, 11, hash_function_fnv1a, engine)
+
+                def work(thread: int) -> None:
+                    for i in range(2000):
+                        # Every thread counts the same shared keys and adds keys of its own.
+                        m.increment('shared' + str(i % 50))
+                        m.put('t' + str(thread) + '-' + str(i), i)
+
+                threads = [Thread(target=work, args=(thread,)) for thread in range(4)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                ref = {'shared' + str(i): 4 * 2000 // 50 for i in range(50)}
+                ref.update(('t' + str(thread) + '-' + str(i), i)
+                           for thread in range(4) for i in range(2000))
+                self.assertEqual(contents(m), ref)
+
+
+class HashFunctionTest(unittest.TestCase):
+    def test_fnv1a_known_answers(self) -> None:
+        # Published FNV-1a 64-bit test vectors.
+        self.assertEqual(hash_function_fnv1a(''), 0xCBF29CE484222325)
+        self.assertEqual(hash_function_fnv1a('a'), 0xAF63DC4C8601EC8C)
+        self.assertEqual(hash_function_fnv1a('foobar'), 0x85944171F73967E8)
+
+    @unittest.skipUnless(sys.hash_info.algorithm == 'siphash13', "needs CPython's SipHash-1-3 str hash")
+    def test_sip_hash_matches_cpython(self) -> None:
+        # With PYTHONHASHSEED=0 CPython hashes ASCII str with SipHash-1-3 under an all-zero
+        # key, which makes its hash() a reference for sip_hash(key, 0). Lengths cover
+        # every tail size; '' is left out, since CPython special-cases it to 0.
+        keys = ['x' * length + str(length) for length in range(17)] + ['hello world, 1234567']
+        script = f"for key in {keys!r}: print(hash(key))"
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                                env=dict(os.environ, PYTHONHASHSEED='0'), check=True).stdout
+        for key, expected in zip(keys, output.split()):
+            signed = sip_hash(key, 0)
+            if signed >= 1 << 63:
+                signed -= 1 << 64
+            self.assertEqual(signed, int(expected), key)
+
+    def test_hash_functions_spread_keys(self) -> None:
+        keys = ['str' + str(i) for i in range(5000)]
+        for function in (hash_function_fnv1a, hash_function_xx, seeded_hash_function(12345)):
+            with self.subTest(function.__name__):
+                hashes = [function(key) for key in keys]
+                self.assertTrue(all(0 <= value < 1 << 64 for value in hashes))
+                self.assertEqual(len(set(hashes)), len(keys))
+                self.assertEqual(hashes, [function(key) for key in keys])
+                # 5000 keys in 1009 buckets: a chain of 20 would be far outside chance.
+                chains = [0] * 1009
+                for value in hashes:
+                    chains[value % 1009] += 1
+                self.assertLess(max(chains), 20)
+        # The sample hash functions collide on anagrams; these do not.
+        self.assertEqual(hash_function_1('abc'), hash_function_1('cba'))
+        self.assertNotEqual(hash_function_xx('abc'), hash_function_xx('cba'))
+
+    def test_seeds_change_sip_hashes(self) -> None:
+        first, second = seeded_hash_function(1), seeded_hash_function(2)
+        self.assertNotEqual(first('key'), second('key'))
+        self.assertEqual(first('key'), sip_hash('key', 1))
+        self.assertNotEqual(hash_function_id(first), hash_function_id(second))
+
+
+def reference_mode(values: list) -> (list, int):
+    """find_mode() on a dict: the modes in the order they reached the top frequency."""
+    counts = {}
+    modes, top = [], 0
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+        if counts[value] > top:
+            modes, top = [value], counts[value]
+        elif counts[value] == top:
+            modes.append(value)
+    return modes, top
+
+
+class FrequencyTest(unittest.TestCase):
+    def test_find_mode_matches_dict(self) -> None:
+        rng = random.Random(11)
+        for trial in range(20):
+            values = [rng.randrange(rng.randrange(1, 40)) for _ in range(rng.randrange(0, 300))]
+            if trial % 2:
+                values = ['v' + str(value) for value in values]
+            with self.subTest(trial=trial):
+                expected = reference_mode(values)
+                for source in (DynamicArray(values), iter(values), (value for value in values)):
+                    modes, freq = hash_map_sc.find_mode(source)
+                    self.assertEqual((list(modes), freq), expected)
+        # The PDF example: ties are listed in the order they reached the top frequency.
+        modes, freq = hash_map_sc.find_mode(DynamicArray(["apple", "apple", "grape", "melon", "peach"]))
+        self.assertEqual((list(modes), freq), (["apple"], 2))
+        modes, freq = hash_map_sc.find_mode(DynamicArray(["one", "two", "three", "four", "five"]))
+        self.assertEqual((list(modes), freq), (["one", "two", "three", "four", "five"], 1))
+
+    def test_find_top_k_matches_dict(self) -> None:
+        rng = random.Random(13)
+        for trial in range(20):
+            values = [rng.randrange(rng.randrange(1, 50)) for _ in range(rng.randrange(0, 400))]
+            counts = {}
+            for value in values:
+                counts[value] = counts.get(value, 0) + 1
+            k = rng.randrange(0, 60)
+            with self.subTest(trial=trial, k=k):
+                top = list(hash_map_sc.find_top_k(iter(values), k))
+                self.assertEqual(len(top), min(k, len(counts)))
+                self.assertEqual(len({value for value, _ in top}), len(top))
+                for value, freq in top:
+                    self.assertEqual(counts[value], freq)
+                # Most frequent first; which of several tied values make the cut is unspecified.
+                self.assertEqual([freq for _, freq in top],
+                                 sorted(counts.values(), reverse=True)[:k])
+
+    def test_find_mode_parallel_matches_find_mode(self) -> None:
+        rng = random.Random(12)
+        for trial in range(12):
+            values = [rng.randrange(rng.randrange(1, 60)) for _ in range(rng.randrange(0, 800))]
+            if trial % 2:
+                values = [str(value) for value in values]
+            chunk_size = rng.randrange(1, 200)
+            with self.subTest(trial=trial, chunk_size=chunk_size):
+                modes, freq = hash_map_sc.find_mode_parallel(iter(values), 2, chunk_size)
+                self.assertEqual((list(modes), freq), reference_mode(values))
+
+    def test_find_mode_parallel_streams_its_input(self) -> None:
+        # Chunks are merged as they finish, so the input is never read far ahead of them.
+        drawn = []
+        merge = hash_map_sc._merge_tallies
+
+        def values():
+            for i in range(20000):
+                drawn.append(i)
+                yield i % 997
+
+        def recording_merge(tallies, futures):
+            self.assertLessEqual(len(drawn), (2 * 2 + 2) * 1000)
+            drawn.clear()
+            merge(tallies, futures)
+
+        with mock.patch.object(hash_map_sc, '_merge_tallies', recording_merge):
+            modes, freq = hash_map_sc.find_mode_parallel(values(), 2, 1000)
+        self.assertEqual((list(modes), freq), reference_mode([i % 997 for i in range(20000)]))
+
+
+class MmapHashMapTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'table.a6')
+
+    def test_matches_dict_and_survives_reopening(self) -> None:
+        rng = random.Random(15)
+        ref = {}
+        with hash_map_mmap.HashMap(self.path, 7) as m:
+            for step in range(3000):
+                key = 'k' + str(rng.randrange(400))
+                if rng.randrange(3):
+                    value = {'step': step, 'tags': ('a', step % 3)}
+                    m.put(key, value)
+                    ref[key] = value
+                else:
+                    m.remove(key)
+                    ref.pop(key, None)
+                self.assertEqual(m.get_size(), len(ref))
+            self.assertEqual(contents(m), ref)
+        with hash_map_mmap.HashMap(self.path, readonly=True) as m:
+            self.assertEqual(contents(m), ref)
+            for key, value in ref.items():
+                self.assertEqual(m.get(key), value)
+            self.assertFalse(m.contains_key('absent'))
+            with self.assertRaises(hash_map_mmap.MmapHashMapException):
+                m.put('k', 1)
+
+    def test_rejects_other_hash_functions(self) -> None:
+        hash_map_mmap.HashMap(self.path).close()
+        with self.assertRaises(hash_map_mmap.MmapHashMapException):
+            hash_map_mmap.HashMap(self.path, function=hash_function_xx)
+        with self.assertRaises(hash_map_mmap.MmapHashMapException):
+            hash_map_mmap.HashMap(self.path, function=lambda key: hash_function_fnv1a(key))
+
+    def test_values_are_data_only(self) -> None:
+        with hash_map_mmap.HashMap(self.path) as m:
+            with self.assertRaises(hash_map_mmap.MmapHashMapException):
+                m.put('bad', object())
+            self.assertEqual(m.get_size(), 0)
+            m.put('k', 'v' * 100)
+        # Overwrite the value record (long enough to hold it) with a pickle that would call
+        # print() when read.
+        with open(self.path, 'r+b') as file:
+            data = file.read()
+            record = hash_map_dump.dumps_data('v' * 100)
+            offset = data.index(record) - 4
+            evil = pickle.dumps(_CallsOnLoad())
+            file.seek(offset)
+            file.write(struct.pack('<I', len(evil)) + evil)
+        with hash_map_mmap.HashMap(self.path, readonly=True) as m:
+            with self.assertRaises(hash_map_mmap.MmapHashMapException):
+                m.get('k')
+
+
+if __name__ == "__main__":
+    unittest.main()